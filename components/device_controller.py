@@ -36,6 +36,9 @@ class TermuxDeviceController(SystemModule, IDeviceController):
         self._timestamped_screenshots = {}  # {timestamp: filepath}
         self._max_timestamp_cache = 10  # 最多保留10张带时间戳的截图
 
+        # 原始截图像素格式不受支持时置为False，之后直接使用PNG截图
+        self._raw_screencap_supported = True
+
     def _execute_command(self, cmd, use_root=False, timeout=10):
         """执行命令
 
@@ -282,6 +285,74 @@ class TermuxDeviceController(SystemModule, IDeviceController):
                 self.log_error(f"截图操作失败: {str(e)}")
                 return None if filename is None else False
 
+    def take_screenshot_raw(self):
+        """截取屏幕并直接返回RGB像素数组，跳过PNG编码、写盘和解码
+
+        screencap不带-p时输出原始RGBA数据，前面是宽、高、格式(部分系统还有色彩空间)的头部。
+
+        Returns:
+            numpy.ndarray: 形状为 (高, 宽, 3) 的RGB数组，失败或像素格式不是RGBA/RGBX时返回None
+        """
+        import numpy as np
+
+        with self._lock:
+            try:
+                cmd = ["su", "-c", "screencap"] if self._has_root else ["screencap"]
+                result = subprocess.run(cmd, capture_output=True, timeout=10)
+                if result.returncode != 0:
+                    self.log_error(f"原始截图失败: {result.stderr.decode(errors='replace')}")
+                    return None
+
+                buf = result.stdout
+                width, height, fmt = (int(v) for v in np.frombuffer(buf, dtype=np.uint32, count=3))
+
+                # 只解析RGBA_8888(1)和RGBX_8888(2)，其他格式(如BGRA_8888、RGB_565)交给PNG截图
+                if fmt not in (1, 2):
+                    self.log_info(f"原始截图像素格式 {fmt} 不受支持，改用PNG截图")
+                    self._raw_screencap_supported = False
+                    return None
+
+                # 头部长度由数据总长度反推（12字节或带色彩空间的16字节）
+                header_size = len(buf) - width * height * 4
+                if header_size not in (12, 16):
+                    self.log_error(f"无法解析原始截图数据，长度: {len(buf)}")
+                    return None
+
+                rgba = np.frombuffer(buf, dtype=np.uint8, offset=header_size).reshape(height, width, 4)
+                return np.ascontiguousarray(rgba[:, :, :3])
+
+            except subprocess.TimeoutExpired:
+                self.log_error("原始截图超时")
+                return None
+            except Exception as e:
+                self.log_error(f"原始截图操作失败: {str(e)}")
+                return None
+
+    def take_screenshot_array(self):
+        """截取屏幕并返回RGB像素数组，供只需要numpy数据的调用方使用
+
+        优先使用原始截图，不可用时退回到PNG截图再转换。
+
+        Returns:
+            numpy.ndarray: 形状为 (高, 宽, 3) 的RGB数组，失败时返回None
+        """
+        import numpy as np
+
+        array = self.take_screenshot_raw() if self._raw_screencap_supported else None
+        if array is not None:
+            return array
+
+        img = self.take_screenshot()
+        if img is None:
+            return None
+
+        # screencap的PNG通常带Alpha通道，直接丢弃Alpha，不再额外转换一次图像
+        if img.mode == 'RGBA':
+            return np.ascontiguousarray(np.asarray(img)[:, :, :3])
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        return np.asarray(img)
+
     def get_screenshot_with_timestamp(self) -> Tuple[Optional[Image.Image], float]:
         """获取带时间戳的截图
 
@@ -11,19 +11,45 @@ import argparse
 import logging
 import time
 import sqlite3
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 
 # 添加系统路径，确保能导入模块
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.FileHandler("export.log"), logging.StreamHandler()]
-)
 logger = logging.getLogger('sql_export_tool')
 
+
+def format_value(value, _str=str, _int=int, _float=float, _bytes=bytes) -> str:
+    """格式化SQL值（导出热路径，按精确类型快速分派）
+
+    数据库面板导出表数据时也使用本函数，两处导出的SQL字面量保持一致。
+
+    Args:
+        value: 要格式化的值
+
+    Returns:
+        格式化后的SQL值字符串
+    """
+    if value is None:
+        return 'NULL'
+    value_type = type(value)
+    if value_type is _int or value_type is _float:
+        return _str(value)
+    if value_type is _str:
+        if "'" in value:
+            value = value.replace("'", "''")
+        return "'" + value + "'"
+    # BLOB导出为十六进制字面量
+    if value_type is _bytes:
+        return "X'" + value.hex() + "'"
+    if isinstance(value, (_int, _float)):
+        return _str(value)
+    if isinstance(value, (bytearray, memoryview)):
+        return "X'" + _bytes(value).hex() + "'"
+    # 转义单引号
+    return "'" + _str(value).replace("'", "''") + "'"
+
+
 class SQLExporter:
     """SQLite数据库导出工具"""
     
@@ -39,8 +65,8 @@ class SQLExporter:
     def connect(self):
         """连接到数据库"""
         try:
+            # 不设置 row_factory，批量取数时直接使用元组
             self.connection = sqlite3.connect(self.db_path)
-            self.connection.row_factory = sqlite3.Row
             return True
         except Exception as e:
             logger.error(f"连接数据库失败: {str(e)}")
@@ -66,7 +92,7 @@ class SQLExporter:
             cursor = self.connection.execute(
                 "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
             )
-            tables = [row['name'] for row in cursor.fetchall()]
+            tables = [name for (name,) in cursor]
             return tables
         except Exception as e:
             logger.error(f"获取表名失败: {str(e)}")
@@ -90,7 +116,7 @@ class SQLExporter:
                 f"SELECT sql FROM sqlite_master WHERE name = '{table}'"
             )
             row = cursor.fetchone()
-            return row['sql'] if row else ""
+            return row[0] if row else ""
         except Exception as e:
             logger.error(f"获取表结构失败: {str(e)}")
             return ""
@@ -110,12 +136,32 @@ class SQLExporter:
                 
         try:
             cursor = self.connection.execute(f"SELECT * FROM {table}")
-            rows = cursor.fetchall()
-            return [{key: row[key] for key in row.keys()} for row in rows]
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
         except Exception as e:
             logger.error(f"获取表数据失败: {str(e)}")
             return []
             
+    def iter_table_rows(self, table: str) -> Tuple[List[str], Iterator[tuple]]:
+        """按元组流式读取表数据，不为每行构建字典
+
+        Args:
+            table: 表名
+
+        Returns:
+            (列名列表, 数据行元组迭代器)，出错时返回空列表和空迭代器
+        """
+        if not self.connection:
+            if not self.connect():
+                return [], iter(())
+
+        try:
+            cursor = self.connection.execute(f"SELECT * FROM {table}")
+            return [desc[0] for desc in cursor.description], cursor
+        except Exception as e:
+            logger.error(f"获取表数据失败: {str(e)}")
+            return [], iter(())
+
     def format_value(self, value) -> str:
         """格式化SQL值
         
@@ -125,14 +171,7 @@ class SQLExporter:
         Returns:
             格式化后的SQL值字符串
         """
-        if value is None:
-            return 'NULL'
-        elif isinstance(value, (int, float)):
-            return str(value)
-        else:
-            # 转义单引号
-            val_str = str(value).replace("'", "''")
-            return f"'{val_str}'"
+        return format_value(value)
             
     def export_to_sql(self, output_path: str, include_data: bool = True, tables: List[str] = None) -> bool:
         """导出数据库到SQL文件
@@ -188,17 +227,16 @@ class SQLExporter:
                     
                     # 导出数据（如果需要）
                     if include_data:
-                        rows = self.get_table_data(table)
-                        if rows:
-                            sql_file.write(f"-- 表 {table} 的数据\n")
-                            for row in rows:
-                                columns = row.keys()
-                                col_str = ', '.join(columns)
-                                # 格式化值
-                                values = [self.format_value(row[col]) for col in columns]
-                                val_str = ', '.join(values)
-                                
-                                sql_file.write(f"INSERT INTO {table} ({col_str}) VALUES ({val_str});\n")
+                        columns, rows = self.iter_table_rows(table)
+                        # 列名来自cursor.description，INSERT前缀每个表只构建一次
+                        insert_prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ("
+                        has_rows = False
+                        for row in rows:
+                            if not has_rows:
+                                sql_file.write(f"-- 表 {table} 的数据\n")
+                                has_rows = True
+                            sql_file.write(insert_prefix + ', '.join(map(format_value, row)) + ");\n")
+                        if has_rows:
                             sql_file.write("\n")
                 
                 # 结束事务
@@ -217,6 +255,13 @@ class SQLExporter:
 
 def main():
     """命令行入口函数"""
+    # 只在命令行运行时配置日志，被其他模块导入时不创建日志文件
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.FileHandler("export.log"), logging.StreamHandler()]
+    )
+
     parser = argparse.ArgumentParser(description="SQLite数据库导出工具")
     parser.add_argument('--db', required=True, help='SQLite数据库路径')
     parser.add_argument('--output', required=True, help='输出SQL文件路径')
@@ -11,6 +11,7 @@ import argparse
 import logging
 import re
 import sqlite3
+from contextlib import closing
 from typing import List
 
 # 添加系统路径，确保能导入模块
@@ -189,8 +190,10 @@ class SQLImporter:
             # 创建备份
             backup_path = f"{self.db_path}.bak"
             try:
-                import shutil
-                shutil.copy2(self.db_path, backup_path)
+                # 使用SQLite在线备份接口，得到一致的快照（包含WAL中尚未写回的内容）
+                with closing(sqlite3.connect(self.db_path)) as source, \
+                        closing(sqlite3.connect(backup_path)) as target:
+                    source.backup(target)
                 logger.info(f"已创建数据库备份: {backup_path}")
             except Exception as e:
                 logger.error(f"创建数据库备份失败: {str(e)}")
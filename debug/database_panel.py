@@ -2,7 +2,10 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
 import sys
 import os
+import csv
+import queue
 import sqlite3
+import threading
 
 # 添加项目根目录到系统路径
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -10,9 +13,116 @@ sys.path.append(project_root)
 
 from data.database_manager import DatabaseManager
 from data.config import Config
+from data.sql_export_tool import format_value
+
+
+def quote_identifier(name):
+    """为SQLite标识符加双引号并转义内部的双引号"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _format_insert_rows(rows, insert_prefix, _format=format_value, _join=', '.join):
+    """将一批数据行格式化为INSERT语句文本
+
+    值的SQL字面量与SQL导出工具共用format_value，BLOB导出为十六进制字面量。
+
+    Args:
+        rows: 数据行元组序列
+        insert_prefix: "INSERT INTO 表 (列) VALUES (" 前缀
+
+    Returns:
+        该批数据的INSERT语句文本
+    """
+    return "".join([
+        insert_prefix + _join(map(_format, row)) + ");\n"
+        for row in rows
+    ])
+
+
+def build_page_query(select_sql, where, key_column, page, page_keys, page_size):
+    """构建分页查询
+
+    有单列主键时使用键集分页（WHERE key > 上一页末行 ORDER BY key），
+    翻页耗时与页码无关；否则退回 LIMIT/OFFSET。
+
+    Args:
+        select_sql: "SELECT ... FROM 表" 部分
+        where: 额外过滤条件，可为None
+        key_column: 分页键列名，无单列主键时为None
+        page: 页码（从0开始）
+        page_keys: 已加载各页末行的键值
+        page_size: 每页行数
+
+    Returns:
+        (SQL语句, 参数元组)
+    """
+    conditions = [f"({where})"] if where else []
+    params = []
+
+    if key_column:
+        quoted_key = quote_identifier(key_column)
+        if page > 0:
+            conditions.append(f"{quoted_key} > ?")
+            params.append(page_keys[page - 1])
+        order_sql = f" ORDER BY {quoted_key} LIMIT ?"
+        params.append(page_size)
+    else:
+        order_sql = " LIMIT ? OFFSET ?"
+        params.extend((page_size, page * page_size))
+
+    where_sql = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return select_sql + where_sql + order_sql, tuple(params)
+
+
+def iter_db_files(directory):
+    """递归查找目录下的.db文件
+
+    Args:
+        directory: 起始目录
+
+    Yields:
+        数据库文件路径
+    """
+    pending = [directory]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.endswith('.db'):
+                        yield entry.path
+        except OSError:
+            continue
+
+
+def clear_treeview(tree):
+    """一次调用清空Treeview的所有行"""
+    children = tree.get_children()
+    if children:
+        tree.delete(*children)
+
+
+def fill_treeview(tree, rows):
+    """批量插入预先格式化好的行
+
+    Args:
+        tree: 目标Treeview
+        rows: 每行的值元组
+
+    Returns:
+        插入的行ID列表
+    """
+    insert = tree.insert
+    return [insert('', 'end', values=values) for values in rows]
 
 
 class DatabaseQueryPanel:
+    # 导出时每批读取的行数
+    EXPORT_BATCH_SIZE = 1000
+    # 查看表数据时每页显示的行数
+    DATA_PAGE_SIZE = 200
+
     def __init__(self, master=None):
         """
         数据库查询面板
@@ -34,18 +144,70 @@ class DatabaseQueryPanel:
         self.current_db_path = db_path
         self.current_connection = None
 
+        # 连接期间复用的游标：_cursor 返回Row，_data_cursor 返回元组
+        self._cursor = None
+        self._data_cursor = None
+
+        # 当前数据库中的表名（用于校验，防止拼接任意SQL）
+        self.table_names = set()
+
+        # 表结构缓存：表名 -> PRAGMA table_info 结果，重新连接时清空
+        self._schema_cache = {}
+
+        # 表数据分页状态
+        self.data_table = None
+        self.data_page = 0
+        self.data_page_keys = []
+        # 当前数据页查询到的行数，用于判断是否还有下一页
+        self.data_page_rows = 0
+
+        # 后台导出状态
+        self.export_thread = None
+        self.export_queue = None
+
         # 创建界面
         self.create_ui()
 
-    def export_table_schema(self):
-        """导出表结构"""
-        # 获取选中的表名
+    def get_selected_table(self):
+        """获取列表中选中的表名
+
+        Returns:
+            表名；未选中或表名不在当前数据库中时返回None
+        """
         selection = self.table_list.curselection()
         if not selection:
             messagebox.showwarning("警告", "请先选择一个表")
-            return
+            return None
 
         table_name = self.table_list.get(selection[0])
+        if table_name not in self.table_names:
+            messagebox.showerror("错误", f"表不存在: {table_name}")
+            return None
+
+        return table_name
+
+    def _get_schema(self, table_name):
+        """获取表结构（PRAGMA table_info），结果按表名缓存
+
+        Args:
+            table_name: 表名
+
+        Returns:
+            表结构行列表
+        """
+        schema = self._schema_cache.get(table_name)
+        if schema is None:
+            self._cursor.execute(f"PRAGMA table_info({quote_identifier(table_name)})")
+            schema = self._cursor.fetchall()
+            self._schema_cache[table_name] = schema
+        return schema
+
+    def export_table_schema(self):
+        """导出表结构"""
+        # 获取选中的表名
+        table_name = self.get_selected_table()
+        if not table_name:
+            return
 
         # 选择保存路径
         file_path = filedialog.asksaveasfilename(
@@ -63,35 +225,33 @@ class DatabaseQueryPanel:
                 messagebox.showerror("错误", "未连接到数据库")
                 return
 
-            cursor = self.current_connection.cursor()
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            schema = cursor.fetchall()
+            schema = self._get_schema(table_name)
 
             # 获取创建表的SQL语句
-            cursor.execute(f"SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
-            create_sql = cursor.fetchone()['sql']
-            cursor.close()
+            self._cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+            create_sql = self._cursor.fetchone()['sql']
 
             # 根据文件扩展名选择输出格式
             _, ext = os.path.splitext(file_path)
 
+            # 先在内存中拼接全部内容，再一次写入文件
+            if ext.lower() == '.csv':
+                # CSV格式
+                lines = ["id,name,type,notnull,default_value,primary_key"]
+                for row in schema:
+                    lines.append(f"{row['cid']},{row['name']},{row['type']},{row['notnull']},"
+                                 f"\"{row['dflt_value'] or ''}\",{row['pk']}")
+            else:
+                # SQL格式
+                lines = [f"-- {table_name} 表结构", f"{create_sql};", "", "-- 字段说明"]
+                for row in schema:
+                    pk = "主键" if row['pk'] == 1 else ""
+                    null = "NOT NULL" if row['notnull'] == 1 else "NULL"
+                    default = f"DEFAULT {row['dflt_value']}" if row['dflt_value'] else ""
+                    lines.append(f"-- {row['name']}: {row['type']} {null} {default} {pk}")
+
             with open(file_path, 'w', encoding='utf-8') as f:
-                if ext.lower() == '.csv':
-                    # CSV格式
-                    f.write("id,name,type,notnull,default_value,primary_key\n")
-                    for row in schema:
-                        f.write(f"{row['cid']},{row['name']},{row['type']},{row['notnull']},"
-                                f"\"{row['dflt_value'] or ''}\",{row['pk']}\n")
-                else:
-                    # SQL格式
-                    f.write(f"-- {table_name} 表结构\n")
-                    f.write(f"{create_sql};\n\n")
-                    f.write("-- 字段说明\n")
-                    for row in schema:
-                        pk = "主键" if row['pk'] == 1 else ""
-                        null = "NOT NULL" if row['notnull'] == 1 else "NULL"
-                        default = f"DEFAULT {row['dflt_value']}" if row['dflt_value'] else ""
-                        f.write(f"-- {row['name']}: {row['type']} {null} {default} {pk}\n")
+                f.write("\n".join(lines) + "\n")
 
             messagebox.showinfo("成功", f"表结构已导出到: {file_path}")
 
@@ -101,13 +261,10 @@ class DatabaseQueryPanel:
     def export_table_data(self):
         """导出表数据"""
         # 获取选中的表名
-        selection = self.table_list.curselection()
-        if not selection:
-            messagebox.showwarning("警告", "请先选择一个表")
+        table_name = self.get_selected_table()
+        if not table_name:
             return
 
-        table_name = self.table_list.get(selection[0])
-
         # 选择保存路径
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
@@ -118,78 +275,120 @@ class DatabaseQueryPanel:
         if not file_path:
             return
 
+        if not self.current_connection:
+            messagebox.showerror("错误", "未连接到数据库")
+            return
+
+        if self.export_thread and self.export_thread.is_alive():
+            messagebox.showwarning("警告", "已有导出任务正在进行")
+            return
+
         try:
-            # 查询表数据
-            if not self.current_connection:
-                messagebox.showerror("错误", "未连接到数据库")
-                return
+            columns = [row['name'] for row in self._get_schema(table_name)]
+        except Exception as e:
+            messagebox.showerror("错误", f"导出表数据失败: {str(e)}")
+            return
 
-            cursor = self.current_connection.cursor()
+        # 在后台线程中导出，主线程轮询进度
+        self.export_queue = queue.Queue()
+        self.export_thread = threading.Thread(
+            target=self._export_table_data_worker,
+            args=(self.current_db_path, table_name, columns, file_path, self.export_queue),
+            daemon=True
+        )
+        self.export_var.set(f"正在导出 {table_name}...")
+        self.export_thread.start()
+        self.window.after(100, self._poll_export_queue)
 
-            # 获取字段名
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [row['name'] for row in cursor.fetchall()]
+    def _export_table_data_worker(self, db_path, table_name, columns, file_path, progress_queue):
+        """后台线程：流式导出表数据
 
-            # 获取所有数据
-            cursor.execute(f"SELECT * FROM {table_name}")
-            data = cursor.fetchall()
-            cursor.close()
+        使用独立的数据库连接，进度和结果通过队列发回主线程。
+
+        Args:
+            db_path: 数据库路径
+            table_name: 表名
+            columns: 要导出的字段名列表
+            file_path: 输出文件路径
+            progress_queue: 进度队列，元素为 (类型, 值)
+        """
+        connection = None
+        try:
+            connection = sqlite3.connect(db_path)
+            cursor = connection.cursor()
+
+            # 流式读取数据，避免一次性加载整张表；显式列出字段，保证列顺序稳定
+            quoted_table = quote_identifier(table_name)
+            col_list = ", ".join(quote_identifier(c) for c in columns)
+            cursor.execute(f"SELECT {col_list} FROM {quoted_table}")
+            data = cursor.fetchmany(self.EXPORT_BATCH_SIZE)
 
             if not data:
-                messagebox.showinfo("提示", "表中没有数据可导出")
+                progress_queue.put(("empty", None))
                 return
 
             # 根据文件扩展名选择输出格式
-            _, ext = os.path.splitext(file_path)
-
-            with open(file_path, 'w', encoding='utf-8') as f:
-                if ext.lower() == '.csv':
-                    # CSV格式
-                    f.write(",".join(columns) + "\n")
-                    for row in data:
-                        row_values = []
-                        for col in columns:
-                            value = row[col]
-                            # 处理特殊字符
-                            if value is None:
-                                value = ""
-                            elif isinstance(value, str):
-                                value = '"' + value.replace('"', '""') + '"'
-                            else:
-                                value = str(value)
-                            row_values.append(value)
-                        f.write(",".join(row_values) + "\n")
+            is_csv = os.path.splitext(file_path)[1].lower() == '.csv'
+            exported = 0
+
+            with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                if is_csv:
+                    # CSV格式，由csv模块负责转义引号、逗号和换行
+                    # 首批之后直接把游标交给writerows，由C实现逐行拉取，不再构造中间列表
+                    writer = csv.writer(f)
+                    writer.writerow(columns)
+                    writer.writerows(data)
+                    writer.writerows(cursor)
                 else:
                     # SQL格式
                     f.write(f"-- {table_name} 表数据\n")
-                    for row in data:
-                        values = []
-                        for col in columns:
-                            value = row[col]
-                            if value is None:
-                                values.append("NULL")
-                            elif isinstance(value, str):
-                                values.append("'" + value.replace("'", "''") + "'")
-                            else:
-                                values.append(str(value))
-                        f.write(f"INSERT INTO {table_name} ({', '.join(columns)}) "
-                                f"VALUES ({', '.join(values)});\n")
-
-            messagebox.showinfo("成功", f"表数据已导出到: {file_path}")
+                    # INSERT前缀只拼接一次，每批数据合并为一次写入
+                    insert_prefix = f"INSERT INTO {quoted_table} ({col_list}) VALUES ("
+                    while data:
+                        f.write(_format_insert_rows(data, insert_prefix))
+                        exported += len(data)
+                        progress_queue.put(("progress", exported))
+                        data = cursor.fetchmany(self.EXPORT_BATCH_SIZE)
+
+            progress_queue.put(("done", file_path))
 
         except Exception as e:
-            messagebox.showerror("错误", f"导出表数据失败: {str(e)}")
+            progress_queue.put(("error", str(e)))
+        finally:
+            if connection:
+                connection.close()
+
+    def _poll_export_queue(self):
+        """主线程：处理导出线程发来的进度和结果"""
+        try:
+            while True:
+                kind, value = self.export_queue.get_nowait()
+                if kind == "progress":
+                    self.export_var.set(f"已导出 {value} 行")
+                elif kind == "empty":
+                    self.export_var.set("")
+                    messagebox.showinfo("提示", "表中没有数据可导出")
+                    return
+                elif kind == "done":
+                    self.export_var.set("")
+                    messagebox.showinfo("成功", f"表数据已导出到: {value}")
+                    return
+                elif kind == "error":
+                    self.export_var.set("")
+                    messagebox.showerror("错误", f"导出表数据失败: {value}")
+                    return
+        except queue.Empty:
+            pass
+
+        self.window.after(100, self._poll_export_queue)
 
     def open_edit_table_dialog(self):
         """打开表数据编辑对话框"""
         # 获取选中的表名
-        selection = self.table_list.curselection()
-        if not selection:
-            messagebox.showwarning("警告", "请先选择一个表")
+        table_name = self.get_selected_table()
+        if not table_name:
             return
 
-        table_name = self.table_list.get(selection[0])
-
         try:
             # 创建编辑对话框
             edit_dialog = tk.Toplevel(self.window)
@@ -236,25 +435,12 @@ class DatabaseQueryPanel:
         ttk.Button(common_db_frame, text="主数据库",
                    command=lambda: self.quick_connect(self.db_manager.db_path)).pack(side=tk.LEFT, padx=5)
 
-        # 遍历任务目录，添加任务数据库按钮
-        tasks_dir = os.path.join(project_root, "tasks")
-        if os.path.exists(tasks_dir):
-            for task_name in os.listdir(tasks_dir):
-                task_dir = os.path.join(tasks_dir, task_name)
-                if os.path.isdir(task_dir) and not task_name.startswith('__'):
-                    # 检查任务目录中的数据库文件
-                    db_files = []
-                    for root, dirs, files in os.walk(task_dir):
-                        for file in files:
-                            if file.endswith('.db'):
-                                db_files.append(os.path.join(root, file))
-
-                    # 为每个找到的数据库添加快速访问按钮
-                    for db_file in db_files:
-                        db_name = os.path.basename(db_file)
-                        button_text = f"{task_name}/{db_name}"
-                        ttk.Button(common_db_frame, text=button_text,
-                                   command=lambda f=db_file: self.quick_connect(f)).pack(side=tk.LEFT, padx=5)
+        # 为每个任务数据库添加快速访问按钮
+        for task_name, db_file in self.find_task_databases():
+            db_name = os.path.basename(db_file)
+            button_text = f"{task_name}/{db_name}"
+            ttk.Button(common_db_frame, text=button_text,
+                       command=lambda f=db_file: self.quick_connect(f)).pack(side=tk.LEFT, padx=5)
 
         # 分隔线
         ttk.Separator(main_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=10)
@@ -294,6 +480,16 @@ class DatabaseQueryPanel:
         # 结果标签
         tk.Label(right_frame, text="查询结果", font=('Arial', 12, 'bold')).pack(pady=5)
 
+        # 分页控制
+        pager_frame = tk.Frame(right_frame)
+        pager_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=2)
+        ttk.Button(pager_frame, text="上一页", command=self.prev_data_page).pack(side=tk.LEFT, padx=5)
+        ttk.Button(pager_frame, text="下一页", command=self.next_data_page).pack(side=tk.LEFT, padx=5)
+        self.page_var = tk.StringVar()
+        ttk.Label(pager_frame, textvariable=self.page_var).pack(side=tk.LEFT, padx=5)
+        self.export_var = tk.StringVar()
+        ttk.Label(pager_frame, textvariable=self.export_var).pack(side=tk.RIGHT, padx=5)
+
         # 结果显示表格
         self.result_tree = ttk.Treeview(right_frame)
         self.result_tree.pack(padx=5, pady=5, fill=tk.BOTH, expand=True)
@@ -310,6 +506,29 @@ class DatabaseQueryPanel:
         # 加载表列表
         self.connect_database()
 
+    @staticmethod
+    def find_task_databases():
+        """查找各任务目录下的数据库文件
+
+        每次打开面板时重新扫描，保证新建的数据库能立即显示；
+        os.scandir按目录项类型判断，不对每个文件单独调用stat。
+
+        Returns:
+            (任务名, 数据库路径) 列表
+        """
+        tasks_dir = os.path.join(project_root, "tasks")
+        try:
+            with os.scandir(tasks_dir) as it:
+                task_entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return []
+
+        task_dbs = []
+        for entry in task_entries:
+            if entry.is_dir() and not entry.name.startswith('__'):
+                task_dbs.extend((entry.name, db_file) for db_file in sorted(iter_db_files(entry.path)))
+        return task_dbs
+
     def browse_database(self):
         """浏览选择数据库文件"""
         # 打开文件对话框
@@ -335,9 +554,14 @@ class DatabaseQueryPanel:
         """连接到当前选择的数据库"""
         db_path = self.db_path_var.get()
 
-        # 关闭现有连接
+        # 表结构缓存只对当前连接有效
+        self._schema_cache.clear()
+
+        # 关闭现有游标和连接
         if self.current_connection:
             try:
+                self._cursor.close()
+                self._data_cursor.close()
                 self.current_connection.close()
             except:
                 pass
@@ -355,8 +579,18 @@ class DatabaseQueryPanel:
                     return
 
             # 连接数据库
-            self.current_connection = sqlite3.connect(db_path)
+            self.current_connection = sqlite3.connect(db_path, cached_statements=256)
             self.current_connection.row_factory = sqlite3.Row
+
+            # 批量写入调优（仅作用于当前连接，不修改数据库文件的日志模式）
+            self.current_connection.execute("PRAGMA synchronous = NORMAL")
+            self.current_connection.execute("PRAGMA temp_store = MEMORY")
+            self.current_connection.execute("PRAGMA cache_size = -20000")
+
+            # 创建复用的游标
+            self._cursor = self.current_connection.cursor()
+            self._data_cursor = self.current_connection.cursor()
+            self._data_cursor.row_factory = None
             self.current_db_path = db_path
 
             # 更新窗口标题
@@ -377,19 +611,19 @@ class DatabaseQueryPanel:
         try:
             # 清空表列表
             self.table_list.delete(0, tk.END)
+            self.table_names = set()
 
             if not self.current_connection:
                 return
 
             # 查询所有表
-            cursor = self.current_connection.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-            tables = [row[0] for row in cursor.fetchall()]
-            cursor.close()
+            self._cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+            tables = [row[0] for row in self._cursor.fetchall()]
 
             # 填充表列表
-            for table in tables:
-                self.table_list.insert(tk.END, table)
+            self.table_names = set(tables)
+            if tables:
+                self.table_list.insert(tk.END, *tables)
 
         except Exception as e:
             messagebox.showerror("错误", f"加载表列表失败: {str(e)}")
@@ -397,27 +631,24 @@ class DatabaseQueryPanel:
     def show_table_schema(self):
         """显示选中表的表结构"""
         # 获取选中的表名
-        selection = self.table_list.curselection()
-        if not selection:
-            messagebox.showwarning("警告", "请先选择一个表")
+        table_name = self.get_selected_table()
+        if not table_name:
             return
 
-        table_name = self.table_list.get(selection[0])
-
         try:
             # 查询表结构
             if not self.current_connection:
                 messagebox.showerror("错误", "未连接到数据库")
                 return
 
-            cursor = self.current_connection.cursor()
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            schema = cursor.fetchall()
-            cursor.close()
+            schema = self._get_schema(table_name)
+
+            # 结果区不再显示表数据，停用分页
+            self.data_table = None
+            self.page_var.set("")
 
             # 清空之前的结果
-            for i in self.result_tree.get_children():
-                self.result_tree.delete(i)
+            clear_treeview(self.result_tree)
 
             # 设置列
             self.result_tree['columns'] = ('名称', '类型', '是否非空', '默认值', '是否主键')
@@ -428,26 +659,50 @@ class DatabaseQueryPanel:
                 self.result_tree.column(col, anchor='center', width=100)
 
             # 插入数据
-            for row in schema:
-                self.result_tree.insert('', 'end', values=(
-                    row['name'],
-                    row['type'],
-                    '是' if row['notnull'] == 1 else '否',
-                    str(row['dflt_value'] or ''),
-                    '是' if row['pk'] == 1 else '否'
-                ))
+            fill_treeview(self.result_tree, [(
+                row['name'],
+                row['type'],
+                '是' if row['notnull'] == 1 else '否',
+                str(row['dflt_value'] or ''),
+                '是' if row['pk'] == 1 else '否'
+            ) for row in schema])
         except Exception as e:
             messagebox.showerror("错误", f"查询表结构失败: {str(e)}")
 
     def show_table_data(self):
         """显示选中表的数据"""
         # 获取选中的表名
-        selection = self.table_list.curselection()
-        if not selection:
-            messagebox.showwarning("警告", "请先选择一个表")
+        table_name = self.get_selected_table()
+        if not table_name:
             return
 
-        table_name = self.table_list.get(selection[0])
+        # 从第一页开始显示
+        self.data_table = table_name
+        self.data_page = 0
+        self.data_page_keys = []
+        self.load_data_page()
+
+    def prev_data_page(self):
+        """显示表数据的上一页"""
+        if not self.data_table or self.data_page == 0:
+            return
+        self.data_page -= 1
+        self.load_data_page()
+
+    def next_data_page(self):
+        """显示表数据的下一页"""
+        if not self.data_table:
+            return
+        # 当前页查询到的行数未满说明已到末页
+        if self.data_page_rows < self.DATA_PAGE_SIZE:
+            return
+        self.data_page += 1
+        self.load_data_page()
+
+    def load_data_page(self):
+        """加载当前表的当前页数据"""
+        table_name = self.data_table
+        self.data_page_rows = 0
 
         try:
             # 查询表数据
@@ -455,21 +710,39 @@ class DatabaseQueryPanel:
                 messagebox.showerror("错误", "未连接到数据库")
                 return
 
-            cursor = self.current_connection.cursor()
-            cursor.execute(f"SELECT * FROM {table_name} LIMIT 200")
-            data = cursor.fetchall()
-            cursor.close()
+            # 获取字段名，只查询需要显示的列
+            quoted_table = quote_identifier(table_name)
+            schema = self._get_schema(table_name)
+            columns = [row['name'] for row in schema]
+            col_list = ", ".join(quote_identifier(c) for c in columns)
+
+            # 单列主键表按主键做键集分页
+            pk_columns = [row['name'] for row in schema if row['pk'] > 0]
+            key_column = pk_columns[0] if len(pk_columns) == 1 else None
+
+            # 数据行使用普通元组，按位置取值
+            query, params = build_page_query(f"SELECT {col_list} FROM {quoted_table}", None, key_column,
+                                             self.data_page, self.data_page_keys, self.DATA_PAGE_SIZE)
+            self._data_cursor.execute(query, params)
+            data = self._data_cursor.fetchall()
+            self.data_page_rows = len(data)
+
+            # 记录本页末行的键值，供下一页查询
+            if key_column and data:
+                del self.data_page_keys[self.data_page:]
+                self.data_page_keys.append(data[-1][columns.index(key_column)])
 
             # 清空之前的结果
-            for i in self.result_tree.get_children():
-                self.result_tree.delete(i)
+            clear_treeview(self.result_tree)
+
+            self.page_var.set(f"{table_name} 第 {self.data_page + 1} 页")
 
             if not data:
                 messagebox.showinfo("提示", "表中没有数据")
                 return
 
             # 设置列
-            self.result_tree['columns'] = list(data[0].keys())
+            self.result_tree['columns'] = columns
 
             # 配置列
             for col in self.result_tree['columns']:
@@ -477,9 +750,7 @@ class DatabaseQueryPanel:
                 self.result_tree.column(col, anchor='center', width=100)
 
             # 插入数据
-            for row in data:
-                values = [str(row[col]) for col in self.result_tree['columns']]
-                self.result_tree.insert('', 'end', values=values)
+            fill_treeview(self.result_tree, [list(map(str, row)) for row in data])
         except Exception as e:
             messagebox.showerror("错误", f"查询表数据失败: {str(e)}")
 
@@ -494,21 +765,26 @@ class DatabaseQueryPanel:
                     messagebox.showerror("错误", "未连接到数据库")
                     return
 
-                cursor = self.current_connection.cursor()
-                cursor.execute(query)
-                data = cursor.fetchall()
-                cursor.close()
+                self._cursor.execute(query)
+                data = self._cursor.fetchall()
+
+                # 自定义语句可能修改了表结构
+                self._schema_cache.clear()
+
+                # 结果区不再显示表数据，停用分页
+                self.data_table = None
+                self.page_var.set("")
 
                 # 清空之前的结果
-                for i in self.result_tree.get_children():
-                    self.result_tree.delete(i)
+                clear_treeview(self.result_tree)
 
                 if not data:
                     messagebox.showinfo("提示", "查询结果为空")
                     return
 
                 # 设置列
-                self.result_tree['columns'] = list(data[0].keys())
+                columns = list(data[0].keys())
+                self.result_tree['columns'] = columns
 
                 # 配置列
                 for col in self.result_tree['columns']:
@@ -516,9 +792,7 @@ class DatabaseQueryPanel:
                     self.result_tree.column(col, anchor='center', width=100)
 
                 # 插入数据
-                for row in data:
-                    values = [str(row[col]) for col in self.result_tree['columns']]
-                    self.result_tree.insert('', 'end', values=values)
+                fill_treeview(self.result_tree, [list(map(str, row)) for row in data])
             except Exception as e:
                 messagebox.showerror("错误", f"自定义查询失败: {str(e)}")
 
@@ -526,17 +800,34 @@ class DatabaseQueryPanel:
 class TableEditor(tk.Frame):
     """表数据编辑器"""
 
+    # 每页加载的行数
+    PAGE_SIZE = 200
+
     def __init__(self, master, connection, table_name):
         super().__init__(master)
         self.master = master
         self.connection = connection
         self.table_name = table_name
+        self.quoted_table = quote_identifier(table_name)
+
+        # 分页与过滤状态
+        self.page = 0
+        self.filter_condition = None
+
+        # 当前页加载时的原始行：行ID -> (主键值, 原始显示值)
+        self._original_rows = {}
+        # 当前页从数据库查询到的行数，用于判断是否还有下一页
+        self._page_row_count = 0
 
         # 获取表结构
         self.cursor = self.connection.cursor()
-        self.cursor.execute(f"PRAGMA table_info({self.table_name})")
-        self.columns = [row['name'] for row in self.cursor.fetchall()]
-        self.pk_columns = [row['name'] for row in self.cursor.fetchall() if row['pk'] == 1]
+        schema = self.cursor.execute(f"PRAGMA table_info({self.quoted_table})").fetchall()
+        self.columns = [row['name'] for row in schema]
+        self.pk_columns = [row['name'] for row in schema if row['pk'] > 0]
+
+        # 单列主键时按主键做键集分页，page_keys 记录各页末行的键值
+        self.key_column = self.pk_columns[0] if len(self.pk_columns) == 1 else None
+        self.page_keys = []
 
         # 如果没有主键，使用所有列
         if not self.pk_columns:
@@ -554,10 +845,12 @@ class TableEditor(tk.Frame):
         toolbar = tk.Frame(self)
         toolbar.pack(fill=tk.X, pady=5)
 
-        ttk.Button(toolbar, text="刷新", command=self.load_data).pack(side=tk.LEFT, padx=5)
+        ttk.Button(toolbar, text="刷新", command=self.refresh_data).pack(side=tk.LEFT, padx=5)
         ttk.Button(toolbar, text="添加行", command=self.add_row).pack(side=tk.LEFT, padx=5)
         ttk.Button(toolbar, text="删除选中行", command=self.delete_row).pack(side=tk.LEFT, padx=5)
         ttk.Button(toolbar, text="保存更改", command=self.save_changes).pack(side=tk.LEFT, padx=5)
+        ttk.Button(toolbar, text="上一页", command=self.prev_page).pack(side=tk.LEFT, padx=5)
+        ttk.Button(toolbar, text="下一页", command=self.next_page).pack(side=tk.LEFT, padx=5)
 
         # 过滤区域
         filter_frame = tk.Frame(self)
@@ -599,46 +892,108 @@ class TableEditor(tk.Frame):
         self.tree.bind("<Double-1>", self.on_cell_double_click)
 
     def load_data(self, filter_condition=None):
-        """加载表数据"""
+        """加载表数据（当前页）"""
+        self.filter_condition = filter_condition
+
         # 清空现有数据
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        clear_treeview(self.tree)
+        self._page_row_count = 0
 
         try:
-            # 构建查询
-            query = f"SELECT * FROM {self.table_name}"
-            params = ()
-
-            if filter_condition:
-                query += f" WHERE {filter_condition}"
-
-            query += " LIMIT 1000"  # 限制返回行数
+            # 构建分页查询
+            query, params = build_page_query(f"SELECT * FROM {self.quoted_table}", filter_condition,
+                                             self.key_column, self.page, self.page_keys, self.PAGE_SIZE)
 
             # 执行查询
             self.cursor.execute(query, params)
             data = self.cursor.fetchall()
+            self._page_row_count = len(data)
+
+            # 记录本页末行的键值，供下一页查询
+            if self.key_column and data:
+                del self.page_keys[self.page:]
+                self.page_keys.append(data[-1][self.key_column])
 
-            # 填充数据
-            for row in data:
-                values = [row[col] for col in self.columns]
-                self.tree.insert("", "end", values=values)
+            # 填充数据，NULL显示为空字符串（保存时空字符串写回NULL）
+            rows = [tuple("" if value is None else str(value) for value in row) for row in data]
+            items = fill_treeview(self.tree, rows)
+
+            # 记录原始数据，保存时据此计算差异
+            pk_indexes = [self.columns.index(col) for col in self.pk_columns]
+            self._original_rows = {
+                item: (tuple(row[i] for i in pk_indexes), values)
+                for item, row, values in zip(items, data, rows)
+            }
 
             # 更新状态
-            self.status_var.set(f"共加载 {len(data)} 行数据")
+            self.status_var.set(f"第 {self.page + 1} 页，共加载 {len(data)} 行数据")
 
         except Exception as e:
             messagebox.showerror("错误", f"加载数据失败: {str(e)}")
 
+    def _item_values(self, item):
+        """读取行的原始字符串值（不经过ttk的数字转换）"""
+        return tuple(self.tk.splitlist(self.tk.call(self.tree, "item", item, "-values")))
+
+    def refresh_data(self):
+        """重新加载当前页"""
+        if not self._confirm_leave_page():
+            return
+        self.load_data(self.filter_condition)
+
+    def prev_page(self):
+        """加载上一页"""
+        if self.page == 0:
+            return
+        if not self._confirm_leave_page():
+            return
+        self.page -= 1
+        self.load_data(self.filter_condition)
+
+    def next_page(self):
+        """加载下一页"""
+        # 当前页查询到的行数未满说明已到末页（不受添加、删除行影响）
+        if self._page_row_count < self.PAGE_SIZE:
+            return
+        if not self._confirm_leave_page():
+            return
+        self.page += 1
+        self.load_data(self.filter_condition)
+
+    def _confirm_leave_page(self):
+        """重新加载表格前处理当前页未保存的更改
+
+        Returns:
+            bool: 可以继续加载返回True，用户取消或保存失败返回False
+        """
+        changes = self._collect_changes()
+        if not any(changes):
+            return True
+
+        answer = messagebox.askyesnocancel("未保存的更改", "当前页有未保存的更改，是否先保存？\n选择\"否\"将放弃这些更改。")
+        if answer is None:
+            return False
+        if answer:
+            try:
+                self._write_changes(*changes)
+            except Exception as e:
+                messagebox.showerror("错误", f"保存更改失败: {str(e)}")
+                return False
+        return True
+
     def apply_filter(self):
         """应用过滤条件"""
+        if not self._confirm_leave_page():
+            return
         filter_text = self.filter_var.get()
+        self.page = 0
         if not filter_text:
             self.load_data()
             return
 
         try:
             # 验证过滤条件语法
-            test_query = f"SELECT 1 FROM {self.table_name} WHERE {filter_text} LIMIT 1"
+            test_query = f"SELECT 1 FROM {self.quoted_table} WHERE {filter_text} LIMIT 1"
             self.cursor.execute(test_query)
 
             # 加载过滤后的数据
@@ -649,7 +1004,10 @@ class TableEditor(tk.Frame):
 
     def clear_filter(self):
         """清除过滤条件"""
+        if not self._confirm_leave_page():
+            return
         self.filter_var.set("")
+        self.page = 0
         self.load_data()
 
     def on_cell_double_click(self, event):
@@ -675,7 +1033,7 @@ class TableEditor(tk.Frame):
         if not item:
             return
 
-        current_value = self.tree.item(item, "values")[column_index]
+        current_value = self._item_values(item)[column_index]
 
         # 创建编辑框
         cell_editor = tk.Toplevel(self)
@@ -697,7 +1055,7 @@ class TableEditor(tk.Frame):
 
         def save_value():
             # 更新表格中的值
-            values = list(self.tree.item(item, "values"))
+            values = list(self._item_values(item))
             values[column_index] = value_var.get()
             self.tree.item(item, values=values)
             cell_editor.destroy()
@@ -732,17 +1090,8 @@ class TableEditor(tk.Frame):
         btn_frame.pack(pady=10)
 
         def save_row():
-            # 获取所有值
-            values = {}
-            for col, entry in entries.items():
-                value = entry.get()
-                if value == "":
-                    values[col] = None
-                else:
-                    values[col] = value
-
-            # 插入树
-            self.tree.insert("", "end", values=[values.get(col) for col in self.columns])
+            # 插入树（空字符串保存时写为NULL）
+            self.tree.insert("", "end", values=[entries[col].get() for col in self.columns])
             row_editor.destroy()
 
         def cancel():
@@ -765,57 +1114,69 @@ class TableEditor(tk.Frame):
         for item in selected:
             self.tree.delete(item)
 
+    def _collect_changes(self):
+        """对比当前页与加载时的原始数据
+
+        Returns:
+            tuple: (插入行列表, 更新行列表, 删除行的主键列表)
+        """
+        inserts = []
+        updates = []
+        remaining = set(self._original_rows)
+
+        for item in self.tree.get_children():
+            values = self._item_values(item)
+            db_values = [None if val == "" else val for val in values]
+
+            if item in self._original_rows:
+                remaining.discard(item)
+                pk_values, original_values = self._original_rows[item]
+                if values != original_values:
+                    updates.append(db_values + list(pk_values))
+            else:
+                inserts.append(db_values)
+
+        deletes = [self._original_rows[item][0] for item in remaining]
+        return inserts, updates, deletes
+
+    def _write_changes(self, inserts, updates, deletes):
+        """在单个事务内写入差异，成功提交，异常自动回滚"""
+        col_sql = ", ".join(quote_identifier(col) for col in self.columns)
+        placeholders = ", ".join("?" for _ in self.columns)
+        set_sql = ", ".join(f"{quote_identifier(col)} = ?" for col in self.columns)
+        # 使用IS比较，无主键回退到全部列时也能匹配NULL
+        where_sql = " AND ".join(f"{quote_identifier(col)} IS ?" for col in self.pk_columns)
+
+        with self.connection:
+            if deletes:
+                self.cursor.executemany(f"DELETE FROM {self.quoted_table} WHERE {where_sql}", deletes)
+            if updates:
+                self.cursor.executemany(f"UPDATE {self.quoted_table} SET {set_sql} WHERE {where_sql}", updates)
+            if inserts:
+                self.cursor.executemany(
+                    f"INSERT INTO {self.quoted_table} ({col_sql}) VALUES ({placeholders})", inserts
+                )
+
     def save_changes(self):
         """保存所有更改到数据库"""
         if not messagebox.askyesno("确认", "确定要保存所有更改到数据库吗?"):
             return
 
         try:
-            # 获取当前数据
-            current_data = []
-            for item in self.tree.get_children():
-                values = self.tree.item(item, "values")
-                row = {col: values[i] for i, col in enumerate(self.columns)}
-                current_data.append(row)
-
-            # 获取原始数据
-            self.cursor.execute(f"SELECT * FROM {self.table_name}")
-            original_data = [dict(row) for row in self.cursor.fetchall()]
-
-            # 开始事务
-            self.connection.execute("BEGIN TRANSACTION")
-
-            # 删除所有原始数据
-            self.cursor.execute(f"DELETE FROM {self.table_name}")
-
-            # 插入新数据
-            for row in current_data:
-                cols = []
-                vals = []
-                for col, val in row.items():
-                    cols.append(col)
-                    if val == "":
-                        vals.append(None)
-                    else:
-                        vals.append(val)
-
-                placeholders = ", ".join(["?" for _ in vals])
-                self.cursor.execute(
-                    f"INSERT INTO {self.table_name} ({', '.join(cols)}) VALUES ({placeholders})",
-                    vals
-                )
+            # 只写入与原始数据的差异
+            changes = self._collect_changes()
+            if not any(changes):
+                messagebox.showinfo("提示", "没有需要保存的更改")
+                return
 
-            # 提交事务
-            self.connection.execute("COMMIT")
+            self._write_changes(*changes)
 
             messagebox.showinfo("成功", "更改已保存到数据库")
 
             # 重新加载数据
-            self.load_data()
+            self.load_data(self.filter_condition)
 
         except Exception as e:
-            # 回滚事务
-            self.connection.execute("ROLLBACK")
             messagebox.showerror("错误", f"保存更改失败: {str(e)}")
 
 def run(self):
@@ -6,9 +6,8 @@ import os
 import sys
 import time
 import logging
-import cv2
-import numpy as np
-from PIL import Image
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 
 # 添加项目根目录到系统路径
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -25,10 +24,128 @@ logging.basicConfig(
 )
 logger = logging.getLogger('RecognitionDebug')
 
-def debug_recognition():
-    """执行识别调试"""
+# 调试图片只是临时文件，用低压缩级别换取更快的PNG编码
+PNG_COMPRESSION = 1
+
+# 不同阈值的标记颜色（BGR）
+THRESHOLD_COLORS = [(0, 255, 0), (255, 255, 0), (0, 165, 255), (0, 0, 255)]
+
+# 绘制颜色
+_GREEN = (0, 255, 0)
+
+# 标签字体样式；字体和绘制函数在导入cv2后由_bind_drawing绑定一次
+_FONT = None
+_FONT_SCALE = 0.5
+_FONT_THICKNESS = 2
+_put_text = None
+
+# OCR识别语言
+OCR_LANGS = ('ch_sim', 'en')
+
+# EasyOCR读取器缓存（按语言区分），加锁保证后台预加载和调用方只初始化一次
+_readers = {}
+_readers_lock = threading.Lock()
+
+def _get_reader(langs):
+    """获取EasyOCR读取器（模型只加载一次，重复调试时复用）
+
+    Args:
+        langs: 语言元组，如 ('ch_sim', 'en')
+
+    Returns:
+        easyocr.Reader实例
+    """
+    with _readers_lock:
+        reader = _readers.get(langs)
+        if reader is None:
+            import easyocr
+            reader = easyocr.Reader(list(langs))
+            _readers[langs] = reader
+        return reader
+
+def _match_text(ocr_results, target_text, threshold):
+    """在已有的OCR结果中查找目标文本
+
+    Args:
+        ocr_results: EasyOCR结果列表 [(bbox, text, prob), ...]
+        target_text: 目标文本
+        threshold: 置信度阈值
+
+    Returns:
+        第一个匹配的 (x, y, w, h)，未找到时返回None
+    """
+    target_lower = target_text.lower()
+    for bbox, text, prob in ocr_results:
+        if prob >= threshold and target_lower in text.lower():
+            xs = [point[0] for point in bbox]
+            ys = [point[1] for point in bbox]
+            x, y = int(min(xs)), int(min(ys))
+            return x, y, int(max(xs)) - x, int(max(ys)) - y
+    return None
+
+def _save_rgb_png(rgb, path):
+    """把RGB数组保存为PNG（在后台线程中调用）
+
+    Args:
+        rgb: 形状为 (高, 宽, 3) 的RGB数组
+        path: 保存路径
+    """
+    from PIL import Image
+    Image.fromarray(rgb).save(path, compress_level=PNG_COMPRESSION)
+
+def _bind_drawing(cv2):
+    """绑定标签绘制用的字体和putText，导入cv2后调用一次
+
+    Args:
+        cv2: 已导入的cv2模块
+    """
+    global _FONT, _put_text
+    _FONT = cv2.FONT_HERSHEY_SIMPLEX
+    _put_text = cv2.putText
+
+def _draw_text(img, text, org, color=_GREEN):
+    """用统一的字体样式在图像上绘制标签
+
+    Args:
+        img: BGR图像
+        text: 标签文本
+        org: 文本左下角坐标
+        color: 文本颜色（BGR）
+    """
+    _put_text(img, text, org, _FONT, _FONT_SCALE, color, _FONT_THICKNESS)
+
+def _scale_results(ocr_results, factor):
+    """把缩放图上的OCR结果坐标换算回原图坐标
+
+    Args:
+        ocr_results: EasyOCR结果列表 [(bbox, text, prob), ...]
+        factor: 坐标乘数（原图尺寸 / 缩放图尺寸）
+
+    Returns:
+        坐标换算后的结果列表
+    """
+    return [
+        ([[point[0] * factor, point[1] * factor] for point in bbox], text, prob)
+        for bbox, text, prob in ocr_results
+    ]
+
+def debug_recognition(ocr_height=720):
+    """执行识别调试
+
+    Args:
+        ocr_height: OCR前把截图缩小到的高度，None表示使用原始分辨率
+    """
     logger.info("=== 开始屏幕识别调试 ===")
     
+    # 图像处理库较重，只在实际执行调试时导入，--help等命令行操作无需加载
+    import cv2
+    import numpy as np
+    _bind_drawing(cv2)
+    
+    # PNG编码在后台线程执行，不阻塞识别流程
+    io_exec = ThreadPoolExecutor(max_workers=2, thread_name_prefix="debug_io")
+    io_futures = []
+    
     try:
         # 导入组件
         from components.device_controller import AndroidDeviceController
@@ -55,6 +172,8 @@ def debug_recognition():
             import easyocr
             logger.info("EasyOCR可用")
             easyocr_available = True
+            # 模型加载较慢，在后台提前加载，与识别器初始化和截图并行
+            reader_future = io_exec.submit(_get_reader, OCR_LANGS)
         except ImportError:
             logger.warning("EasyOCR不可用，将只使用pytesseract")
             easyocr_available = False
@@ -65,129 +184,165 @@ def debug_recognition():
         
         # 步骤3: 截取屏幕
         logger.info("步骤3: 截取屏幕")
-        screenshot = device.take_screenshot()
-        if screenshot is None:
+        # 直接从设备控制器获取numpy数组，省去PNG解码和PIL到numpy的复制
+        if hasattr(device, 'take_screenshot_array'):
+            screenshot_np = device.take_screenshot_array()
+        else:
+            screenshot = device.take_screenshot()
+            screenshot_np = None if screenshot is None else np.array(screenshot.convert('RGB'))
+        
+        if screenshot_np is None:
             logger.error("截图失败")
             return
         
-        # 保存截图用于后续分析
+        # 在后台线程保存截图用于后续分析，不阻塞识别
         debug_dir = os.path.join(project_root, 'debug', 'temp')
         os.makedirs(debug_dir, exist_ok=True)
         screenshot_path = os.path.join(debug_dir, 'debug_screenshot.png')
-        screenshot.save(screenshot_path)
-        logger.info(f"截图已保存到: {screenshot_path}")
-        
-        # 转换为numpy数组
-        screenshot_np = np.array(screenshot)
+        io_futures.append(io_exec.submit(_save_rgb_png, screenshot_np, screenshot_path))
+        logger.info(f"截图将保存到: {screenshot_path}")
         
         # 步骤4: 执行文本识别 (多种阈值)
         logger.info("步骤4: 执行文本识别")
         target_texts = ['斗地主', '经典场', '菜单']
         thresholds = [0.1, 0.3, 0.5, 0.7]
         
+        # 只执行一次OCR，各目标文本和阈值组合都在同一份结果上过滤
+        ocr_results = None
+        if easyocr_available:
+            try:
+                # 获取读取器（后台预加载完成后直接复用），模型加载失败时同样只记录错误
+                reader = reader_future.result()
+                
+                ocr_start = time.time()
+                logger.info("开始OCR识别...")
+                # EasyOCR按RGB处理ndarray输入，直接使用内存中的截图，无需转换或重新解码
+                # 检测耗时随像素数增长，先缩小再识别，结果坐标换算回原图
+                height = screenshot_np.shape[0]
+                if ocr_height and height > ocr_height:
+                    scale = ocr_height / height
+                    small = cv2.resize(screenshot_np, None, fx=scale, fy=scale,
+                                       interpolation=cv2.INTER_AREA)
+                    logger.info(f"OCR输入缩放到: {small.shape[1]}x{small.shape[0]}")
+                    ocr_results = _scale_results(reader.readtext(small), 1 / scale)
+                else:
+                    ocr_results = reader.readtext(screenshot_np)
+                ocr_time = time.time() - ocr_start
+                
+                logger.info(f"OCR识别完成，耗时: {ocr_time:.2f}秒")
+                logger.info(f"识别到 {len(ocr_results)} 个文本区域")
+            except Exception as e:
+                logger.error(f"EasyOCR识别失败: {e}")
+        
         for target_text in target_texts:
             logger.info(f"目标文本: '{target_text}'")
             
-            for threshold in thresholds:
+            # 同一目标文本的所有阈值结果画在同一张图上，只复制和保存一次
+            marked_img = None
+            
+            for i, threshold in enumerate(thresholds):
                 logger.info(f"使用阈值: {threshold}")
-                result = recognizer.find_text(target_text, threshold=threshold)
+                if ocr_results is not None:
+                    result = _match_text(ocr_results, target_text, threshold)
+                else:
+                    result = recognizer.find_text(target_text, threshold=threshold)
                 
                 if result:
                     logger.info(f"找到匹配: {result}")
                     
                     # 在图像上标记结果
-                    marked_img = screenshot_np.copy()
+                    if marked_img is None:
+                        marked_img = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
+                    color = THRESHOLD_COLORS[i % len(THRESHOLD_COLORS)]
                     x, y, w, h = result
-                    cv2.rectangle(marked_img, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                    cv2.putText(
-                        marked_img, 
-                        f"{target_text} ({threshold})", 
-                        (x, y - 10), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 
-                        0.5, 
-                        (0, 255, 0), 
-                        2
-                    )
-                    
-                    # 保存标记后的图像
-                    result_path = os.path.join(
-                        debug_dir, 
-                        f"result_{target_text.replace(' ', '_')}_{threshold}.png"
-                    )
-                    cv2.imwrite(
-                        result_path, 
-                        cv2.cvtColor(marked_img, cv2.COLOR_RGB2BGR)
-                    )
-                    logger.info(f"结果图像已保存到: {result_path}")
+                    cv2.rectangle(marked_img, (x, y), (x + w, y + h), color, 2)
+                    _draw_text(marked_img, f"{target_text} ({threshold})", (x, y - 10 - 15 * i), color)
                 else:
                     logger.info(f"未找到匹配")
-        
-        # 步骤5: 如果有EasyOCR，尝试直接调用EasyOCR
-        if easyocr_available:
-            logger.info("步骤5: 直接使用EasyOCR")
-            import easyocr
             
-            # 初始化读取器
-            reader = easyocr.Reader(['ch_sim', 'en'])
-            
-            # 读取图像
-            img_for_ocr = cv2.imread(screenshot_path)
+            # 保存标记后的图像
+            if marked_img is not None:
+                result_path = os.path.join(
+                    debug_dir, 
+                    f"result_{target_text.replace(' ', '_')}.png"
+                )
+                io_futures.append(io_exec.submit(
+                    cv2.imwrite, result_path, marked_img,
+                    [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION]
+                ))
+                logger.info(f"结果图像将保存到: {result_path}")
+        
+        # 步骤5: 如果有EasyOCR结果，输出详细信息
+        if ocr_results is not None:
+            logger.info("步骤5: EasyOCR识别详情")
             
-            # 进行OCR
             try:
-                ocr_start = time.time()
-                logger.info("开始OCR识别...")
-                results = reader.readtext(img_for_ocr)
-                ocr_time = time.time() - ocr_start
-                
-                logger.info(f"OCR识别完成，耗时: {ocr_time:.2f}秒")
-                logger.info(f"识别到 {len(results)} 个文本区域")
+                # 目标文本只转一次小写
+                lowered_targets = [(t.lower(), t) for t in target_texts]
                 
                 # 记录每个识别结果
-                for i, (bbox, text, prob) in enumerate(results):
+                for i, (bbox, text, prob) in enumerate(ocr_results):
                     logger.info(f"结果 {i+1}: '{text}' (置信度: {prob:.4f})")
                     
                     # 检查是否包含目标文本
-                    for target_text in target_texts:
-                        if target_text.lower() in text.lower():
+                    text_lower = text.lower()
+                    for target_lower, target_text in lowered_targets:
+                        if target_lower in text_lower:
                             logger.info(f"  ✓ 包含目标文本 '{target_text}'")
                 
                 # 在图像上标记所有识别结果
-                visual_img = img_for_ocr.copy()
-                for bbox, text, prob in results:
+                # 只在可视化时转换一次BGR副本用于绘制；有OpenCL时用UMat交给OpenCL执行
+                use_opencl = cv2.ocl.haveOpenCL()
+                visual_src = cv2.UMat(screenshot_np) if use_opencl else screenshot_np
+                visual_img = cv2.cvtColor(visual_src, cv2.COLOR_RGB2BGR)
+                if ocr_results:
+                    # 一次性转换所有边界框 (N, 4, 2)，向量化求左上角
+                    bboxes = np.asarray([r[0] for r in ocr_results], dtype=np.int32)
+                    x_mins = bboxes[:, :, 0].min(axis=1)
+                    y_mins = bboxes[:, :, 1].min(axis=1)
+                    
                     # 绘制边界框
-                    pts = np.array(bbox, np.int32)
-                    cv2.polylines(visual_img, [pts.reshape((-1, 1, 2))], True, (0, 255, 0), 2)
+                    cv2.polylines(visual_img, list(bboxes.reshape(-1, 4, 1, 2)), True, _GREEN, 2)
                     
                     # 添加文本
-                    x_min = min(point[0] for point in bbox)
-                    y_min = min(point[1] for point in bbox)
-                    cv2.putText(
-                        visual_img, 
-                        f"{text[:10]}.. ({prob:.2f})", 
-                        (int(x_min), int(y_min) - 10), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 
-                        0.5, 
-                        (0, 255, 0), 
-                        2
-                    )
+                    for (_, text, prob), x_min, y_min in zip(ocr_results, x_mins, y_mins):
+                        _draw_text(visual_img, f"{text[:10]}.. ({prob:.2f})", (int(x_min), int(y_min) - 10))
                 
-                # 保存可视化结果
+                # 保存可视化结果（UMat先取回内存）
+                if use_opencl:
+                    visual_img = visual_img.get()
                 visual_path = os.path.join(debug_dir, 'easyocr_results.png')
-                cv2.imwrite(visual_path, visual_img)
-                logger.info(f"EasyOCR识别结果已保存到: {visual_path}")
+                io_futures.append(io_exec.submit(
+                    cv2.imwrite, visual_path, visual_img,
+                    [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION]
+                ))
+                logger.info(f"EasyOCR识别结果将保存到: {visual_path}")
                 
             except Exception as e:
-                logger.error(f"EasyOCR识别失败: {e}")
+                logger.error(f"EasyOCR结果可视化失败: {e}")
         
         # 步骤6: 识别图像
         logger.info("步骤6: 执行图像识别")
         # 这里您可以添加具体的图像识别测试
         
+        # 等待所有图像保存完成
+        wait(io_futures)
+        for future in io_futures:
+            if future.exception() is not None:
+                logger.error(f"保存图像失败: {future.exception()}")
+        
         logger.info("=== 屏幕识别调试完成 ===")
         
     except Exception as e:
         logger.error(f"调试过程出错: {e}", exc_info=True)
+    finally:
+        io_exec.shutdown(wait=True)
 
 if __name__ == "__main__":
-    debug_recognition()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="屏幕识别调试")
+    parser.add_argument('--full-res', action='store_true', help="OCR使用原始分辨率，不缩小截图")
+    args = parser.parse_args()
+    
+    debug_recognition(ocr_height=None if args.full_res else 720)
@@ -6,8 +6,8 @@ import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
-import threading
-import time
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 from .screen_panel import ScreenPanel
 from .recognition_panel import RecognitionPanel
@@ -17,6 +17,17 @@ from .utils import setup_logger
 class DebugWindow:
     """屏幕识别和状态识别调试窗口"""
     
+    # 日志文本框刷新间隔(毫秒)和每次最多写入的行数
+    LOG_DRAIN_INTERVAL = 50
+    LOG_DRAIN_BATCH = 128
+    # 日志文本框最多保留的行数
+    LOG_MAX_LINES = 2000
+    # 日志文本框不可见时队列积压的上限，超出后丢弃较早的一半
+    LOG_BACKLOG_LIMIT = 1500
+    # 状态监控间隔和识别结果轮询间隔(毫秒)
+    MONITOR_INTERVAL = 2000
+    MONITOR_POLL_INTERVAL = 50
+    
     def __init__(self, device_controller=None, screen_recognizer=None, state_manager=None):
         """初始化调试窗口
         
@@ -47,9 +58,12 @@ class DebugWindow:
         # 创建UI
         self._setup_ui()
         
-        # 状态标志
-        self.running = False
-        self.monitor_thread = None
+        # 状态监控由root.after定时驱动，不为其单独开线程
+        self._monitor_after_id = None
+        
+        # 识别等耗时计算放到工作线程池，UI更新只在主线程中执行
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="debug_worker")
+        self._state_future = None
     
     def _setup_ui(self):
         """设置UI组件"""
@@ -106,28 +120,24 @@ class DebugWindow:
         
         log_scroll.config(command=self.log_text.yview)
         
-        # 自定义日志处理器，将日志输出到文本框
+        # 自定义日志处理器，只把日志放入有界队列，由主线程定时批量写入文本框
         class TextHandler(logging.Handler):
-            def __init__(self, text_widget):
+            def __init__(self):
                 logging.Handler.__init__(self)
-                self.text_widget = text_widget
+                self.q = queue.Queue(maxsize=2048)
                 
             def emit(self, record):
-                msg = self.format(record)
-                
-                def append():
-                    self.text_widget.configure(state='normal')
-                    self.text_widget.insert(tk.END, msg + '\n')
-                    self.text_widget.configure(state='disabled')
-                    self.text_widget.see(tk.END)
-                    
-                # 主线程中执行UI更新
-                self.text_widget.after(0, append)
+                try:
+                    self.q.put_nowait(self.format(record))
+                except queue.Full:
+                    # 日志刷屏时直接丢弃，避免拖垮UI线程
+                    pass
         
         # 添加文本处理器到logger
-        text_handler = TextHandler(self.log_text)
-        text_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        self.logger.addHandler(text_handler)
+        self.log_handler = TextHandler()
+        self.log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self.logger.addHandler(self.log_handler)
+        self.root.after(self.LOG_DRAIN_INTERVAL, self._drain_log)
         
         # 底部状态栏
         status_bar = ttk.Frame(self.root)
@@ -144,6 +154,40 @@ class DebugWindow:
         # 绑定窗口关闭事件
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
     
+    def _drain_log(self):
+        """批量取出日志队列中的记录，一次性写入日志文本框"""
+        log_queue = self.log_handler.q
+        
+        # 窗口最小化等不可见时不写入文本框，日志留在队列中等待窗口恢复
+        if not self.log_text.winfo_viewable():
+            if log_queue.qsize() > self.LOG_BACKLOG_LIMIT:
+                try:
+                    for _ in range(log_queue.qsize() // 2):
+                        log_queue.get_nowait()
+                except queue.Empty:
+                    pass
+            self.root.after(self.LOG_DRAIN_INTERVAL, self._drain_log)
+            return
+        
+        lines = []
+        try:
+            while len(lines) < self.LOG_DRAIN_BATCH:
+                lines.append(log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        if lines:
+            self.log_text.configure(state='normal')
+            self.log_text.insert(tk.END, '\n'.join(lines) + '\n')
+            # 超出上限时删除最早的行，保持文本框大小固定
+            end_line = int(self.log_text.index('end-1c').split('.')[0])
+            if end_line > self.LOG_MAX_LINES:
+                self.log_text.delete('1.0', f'{end_line - self.LOG_MAX_LINES}.0')
+            self.log_text.configure(state='disabled')
+            self.log_text.see(tk.END)
+        
+        self.root.after(self.LOG_DRAIN_INTERVAL, self._drain_log)
+    
     def run(self):
         """运行调试窗口"""
         self.logger.info("调试窗口已启动")
@@ -214,7 +258,7 @@ class DebugWindow:
     
     def start_monitoring(self):
         """启动状态监控"""
-        if self.running:
+        if self._monitor_after_id is not None:
             return
             
         try:
@@ -227,11 +271,8 @@ class DebugWindow:
             # 启动状态管理器的监控
             self.state_manager.start_monitoring()
             
-            # 启动本地监控线程
-            self.running = True
-            self.monitor_thread = threading.Thread(target=self.monitoring_loop)
-            self.monitor_thread.daemon = True
-            self.monitor_thread.start()
+            # 启动本地监控定时器
+            self._monitor_after_id = self.root.after(0, self._monitor_tick)
             
             self.logger.info("状态监控已启动")
             self.status_label.config(text="监控中...")
@@ -243,7 +284,7 @@ class DebugWindow:
     
     def stop_monitoring(self):
         """停止状态监控"""
-        if not self.running:
+        if self._monitor_after_id is None:
             return
             
         try:
@@ -251,11 +292,10 @@ class DebugWindow:
             if self.state_manager.is_initialized:
                 self.state_manager.stop_monitoring()
                 
-            # 停止本地监控线程
-            self.running = False
-            if self.monitor_thread:
-                self.monitor_thread.join(timeout=1)
-                self.monitor_thread = None
+            # 停止本地监控定时器，仍在执行的识别结果将被忽略
+            self.root.after_cancel(self._monitor_after_id)
+            self._monitor_after_id = None
+            self._state_future = None
                 
             self.logger.info("状态监控已停止")
             self.status_label.config(text="就绪")
@@ -264,28 +304,45 @@ class DebugWindow:
             self.logger.error(f"停止监控失败: {str(e)}")
             messagebox.showerror("错误", f"停止监控失败: {str(e)}")
     
-    def monitoring_loop(self):
-        """监控循环"""
-        while self.running:
-            try:
-                # 获取当前状态
-                current_state = self.state_manager.get_current_state()
-                
-                # 在界面上更新状态
-                if current_state:
-                    self.root.after(0, lambda: self.status_label.config(
-                        text=f"当前状态: {current_state}"
-                    ))
-                    
-                    # 如果在状态面板，自动选中当前状态
-                    if self.notebook.index(self.notebook.select()) == 2:  # 状态面板索引
-                        self.root.after(0, lambda s=current_state: self.state_panel.select_state_in_list(s))
-                
-            except Exception as e:
-                self.logger.error(f"监控循环出错: {str(e)}")
+    def _monitor_tick(self):
+        """提交一次状态识别，并开始轮询识别结果"""
+        try:
+            # 获取当前状态（识别在线程池中执行）
+            self._state_future = self.executor.submit(self.state_manager.get_current_state)
+        except Exception as e:
+            self.logger.error(f"提交状态识别失败: {str(e)}")
+            self._monitor_after_id = self.root.after(self.MONITOR_INTERVAL, self._monitor_tick)
+            return
+        
+        self._monitor_after_id = self.root.after(self.MONITOR_POLL_INTERVAL, self._poll_state_future)
+    
+    def _poll_state_future(self):
+        """检查状态识别是否完成，完成后更新界面并安排下一次识别"""
+        if not self._state_future.done():
+            self._monitor_after_id = self.root.after(self.MONITOR_POLL_INTERVAL, self._poll_state_future)
+            return
+        
+        try:
+            current_state = self._state_future.result()
             
-            # 每2秒检查一次
-            time.sleep(2)
+            # 在界面上更新状态
+            if current_state:
+                self._show_current_state(current_state)
+                
+        except Exception as e:
+            self.logger.error(f"监控循环出错: {str(e)}")
+        
+        # 每2秒检查一次
+        self._state_future = None
+        self._monitor_after_id = self.root.after(self.MONITOR_INTERVAL, self._monitor_tick)
+    
+    def _show_current_state(self, current_state):
+        """在界面上显示当前状态"""
+        self.status_label.config(text=f"当前状态: {current_state}")
+        
+        # 如果在状态面板，自动选中当前状态
+        if self.notebook.index(self.notebook.select()) == 2:  # 状态面板索引
+            self.state_panel.select_state_in_list(current_state)
     
     def on_close(self):
         """窗口关闭处理"""
@@ -309,6 +366,9 @@ class DebugWindow:
             self.logger.error(f"关闭窗口出错: {str(e)}")
             
         finally:
+            # 不等待仍在执行的识别任务
+            self.executor.shutdown(wait=False)
+            
             # 销毁窗口
             self.root.destroy()
 
@@ -316,10 +376,6 @@ class DebugWindow:
 def main():
     """主函数"""
     import argparse
-    from components.device_controller import AndroidDeviceController
-    from components.screen_recognizer import ScreenRecognizer
-    from components.state_manager import StateManager
-    from data.database_manager import DatabaseManager
     
     # 命令行参数
     parser = argparse.ArgumentParser(description="屏幕识别和状态识别调试工具")
@@ -327,6 +383,12 @@ def main():
     parser.add_argument("--db-path", type=str, default="automation.db", help="数据库路径")
     args = parser.parse_args()
     
+    # 参数解析成功后再导入各组件，--help和参数错误时无需加载
+    from components.device_controller import AndroidDeviceController
+    from components.screen_recognizer import ScreenRecognizer
+    from components.state_manager import StateManager
+    from data.database_manager import DatabaseManager
+    
     try:
         # 初始化组件
         db_manager = DatabaseManager(db_path=args.db_path)
@@ -7,38 +7,244 @@ import os
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import logging
+import logging.handlers
+import queue
+import atexit
+import codecs
+import importlib
+import mmap
+import subprocess
+import threading
 import time
+from importlib.util import find_spec
+from pathlib import Path
 
 # 添加项目根目录到系统路径
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
-# 配置日志
+# 日志目录
 logs_dir = os.path.join(project_root, 'debug', 'logs')
-os.makedirs(logs_dir, exist_ok=True)
-
-log_filename = os.path.join(logs_dir, f'launcher_{time.strftime("%Y%m%d_%H%M%S")}.log')
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename=log_filename,
-    filemode='w'
-)
 logger = logging.getLogger('DebugLauncher')
 
-# 输出日志到控制台
-console = logging.StreamHandler()
-console.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-console.setFormatter(formatter)
-logger.addHandler(console)
-
-logger.info(f"调试启动器日志文件: {log_filename}")
-logger.info(f"项目根目录: {project_root}")
+# 日志查看器每次读取和插入的块大小
+LOG_CHUNK_SIZE = 1 << 20
+# 日志查看器默认只加载文件末尾的字节数
+LOG_TAIL_BYTES = 2 << 20
+# 重新加载时已显示内容超过该字节数则换用新的文本框，不逐段删除旧内容
+LOG_SWAP_BYTES = 10 << 20
+
+# 依赖的pip包名 -> 导入模块名
+DEPENDENCY_MODULES = {
+    "easyocr": "easyocr",
+    "numpy": "numpy",
+    "opencv-python": "cv2",
+    "pytesseract": "pytesseract",
+    "pillow": "PIL",
+}
+
+# 启动器日志文件处理器，关闭窗口时用于刷新缓冲
+_log_file_handler = None
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """带缓冲的文件日志处理器
+
+    日志先写入64KB缓冲区，只在WARNING及以上级别、定时器到期或关闭时刷新到磁盘，
+    减少每条日志一次write系统调用的开销。
+    """
+
+    def __init__(self, filename, mode='a', buffer_size=65536, flush_interval=30):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._flush_timer = None
+        super().__init__(filename, mode)
+        self._schedule_flush()
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+
+    def _schedule_flush(self):
+        """安排下一次定时刷新"""
+        self._flush_timer = threading.Timer(self.flush_interval, self._periodic_flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _periodic_flush(self):
+        self.flush()
+        if self.stream is not None:
+            self._schedule_flush()
+
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            # 警告和错误立即落盘，其余日志留在缓冲区
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        super().close()
+
+
+def _iter_log_chunks(mm, start=0, chunk_size=LOG_CHUNK_SIZE, end=None):
+    """按块增量解码内存映射的日志文件
+
+    Args:
+        mm: 日志文件的mmap对象
+        start: 起始字节偏移
+        chunk_size: 每块字节数
+        end: 结束字节偏移（不含），None表示到文件末尾
+
+    Yields:
+        解码后的文本块（UTF-8，无法解码的字节替换为占位符）
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    end = len(mm) if end is None else end
+
+    # 提示内核顺序读取以加大预读，已解码的页随即释放，Windows没有madvise
+    advise = hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL') \
+        and hasattr(mmap, 'MADV_DONTNEED')
+    if advise:
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    released = start - start % mmap.PAGESIZE
+
+    for offset in range(start, end, chunk_size):
+        chunk_end = min(offset + chunk_size, end)
+        text = decoder.decode(mm[offset:chunk_end])
+        if advise:
+            consumed = chunk_end - chunk_end % mmap.PAGESIZE
+            if consumed > released:
+                mm.madvise(mmap.MADV_DONTNEED, released, consumed - released)
+                released = consumed
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def _pip_install(args):
+    """在子进程中执行一次pip install（可在后台线程调用）
+
+    Args:
+        args: pip install的参数列表
+
+    Raises:
+        subprocess.CalledProcessError: pip返回非零状态码
+    """
+    subprocess.run([sys.executable, "-m", "pip", "install", *args], check=True)
+
+    # 让新安装的包能被find_spec找到
+    importlib.invalidate_caches()
+
+
+def _configure_logging():
+    """配置启动器日志（只在启动器实际运行时调用，导入本模块不会创建日志文件）"""
+    global _log_file_handler
+    os.makedirs(logs_dir, exist_ok=True)
+
+    log_filename = os.path.join(logs_dir, f'launcher_{time.strftime("%Y%m%d_%H%M%S")}.log')
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    # 所有日志写入文件（带缓冲）
+    file_handler = BufferedFileHandler(log_filename, mode='w')
+    file_handler.setFormatter(formatter)
+    _log_file_handler = file_handler
+
+    # 启动器自身INFO及以上的日志输出到控制台
+    console = logging.StreamHandler()
+    console.setLevel(logging.INFO)
+    console.addFilter(logging.Filter(logger.name))
+    console.setFormatter(formatter)
+
+    # UI线程只把日志记录放入队列，由后台监听线程写文件和控制台
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    logger.info("调试启动器日志文件: %s", log_filename)
+    logger.info("项目根目录: %s", project_root)
+
+# 各面板的按钮布局表: (按钮文字, 处理方法名)
+_INIT_BUTTONS = (
+    ("完整初始化", "full_initialize"),
+    ("仅设备调试", "device_only_initialize"),
+    ("仅数据库调试", "database_only_initialize"),
+)
+_DEVICE_BUTTONS = (
+    ("屏幕识别调试", "open_screen_recognition_panel"),
+    ("设备控制调试", "open_device_control_panel"),
+    ("OCR文本识别调试", "open_ocr_debug_panel"),
+    ("设备诊断工具", "open_device_diagnostic_tool"),
+)
+_DATABASE_BUTTONS = (
+    ("数据库查询", "open_database_panel"),
+)
+_TASK_BUTTONS = (
+    ("状态管理调试", "open_state_management_panel"),
+    ("任务管理调试", "open_task_management_panel"),
+    ("账号服务调试", "open_account_service_panel"),
+)
+_DIAG_BUTTONS = (
+    ("检查系统状态", "check_system_status"),
+    ("重新初始化系统", "reinitialize_system"),
+    ("查看系统日志", "view_system_logs"),
+)
 
 # 全局变量，用于存储已初始化的模块实例
 initialized_modules = {}
 
+# 延迟创建的模块工厂函数，首次通过get_module访问时才导入并创建实例
+module_factories = {}
+
+
+def has_module(name):
+    """模块是否已初始化或已注册工厂函数"""
+    return name in initialized_modules or name in module_factories
+
+
+def get_module(name):
+    """获取模块实例，首次访问时调用注册的工厂函数创建并缓存
+
+    Args:
+        name: 模块名称
+
+    Returns:
+        模块实例，未初始化也未注册时返回None
+    """
+    module = initialized_modules.get(name)
+    if module is None and name in module_factories:
+        # 创建成功后才移除工厂函数，构造失败时下次访问仍可重试
+        module = module_factories[name]()
+        initialized_modules[name] = module
+        del module_factories[name]
+    return module
+
+
+def get_screen_recognizer():
+    """获取屏幕识别器，创建失败时记录错误并返回None，不影响调用方继续打开面板"""
+    try:
+        return get_module('ScreenRecognizer')
+    except Exception as e:
+        logger.error(f"初始化屏幕识别器失败: {e}")
+        return None
+
 
 class DebugLauncher:
     def __init__(self):
@@ -48,6 +254,28 @@ class DebugLauncher:
         # 初始化状态
         self.initialized = False
 
+        # 日志文件列表缓存 (扫描时间, 文件列表)
+        self._log_file_cache = None
+
+        # 正在进行的日志加载 {文本框路径: 取消事件}
+        self._log_loads = {}
+
+        # 已加载的日志文件状态 {文本框路径: (路径, 末尾字节数, mtime_ns, 已加载字节数)}
+        self._log_state = {}
+
+        # 可共享给其他查看器的日志文本框 {(日志文件, 末尾字节数): 文本框}
+        self._log_masters = {}
+
+        # 本次运行中依赖是否已检查通过，以及是否正在后台安装
+        self._deps_verified = False
+        self._deps_installing = False
+
+        # adb设备列表缓存 (获取时间, 显示文本)
+        self._adb_cache = None
+
+        # 已创建的调试面板窗口 {面板名: Toplevel}，关闭时只隐藏，再次打开直接复用
+        self._panel_windows = {}
+
         # 创建主窗口
         self.root = tk.Tk()
         self.root.title("调试系统启动器")
@@ -59,17 +287,39 @@ class DebugLauncher:
             if os.path.exists(icon_path):
                 self.root.iconbitmap(icon_path)
         except Exception as e:
-            logger.warning(f"设置窗口图标失败: {e}")
+            logger.warning("设置窗口图标失败: %s", e)
 
         # 创建状态变量
         self.status_var = tk.StringVar(value="准备就绪")
 
-        # 创建初始化提示
-        self.init_frame = ttk.Frame(self.root)
+        # 创建初始化提示（只创建一次，切换页面时隐藏/显示）
+        self.init_frame = self._build_init_frame()
         self.init_frame.pack(fill=tk.BOTH, expand=True)
+        self._diag_button = None
+
+        # 已创建的页面 {页面名: 框架} 和当前显示的页面
+        self._pages = {}
+        self._current_page = None
+
+        # 显示状态栏
+        self.status_bar = ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+
+        # 绑定窗口关闭事件
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        logger.info("调试启动器界面初始化完成")
+
+    def _build_init_frame(self):
+        """创建初始化模式选择界面
+
+        Returns:
+            初始化界面框架（未pack）
+        """
+        init_frame = ttk.Frame(self.root)
 
         init_label = ttk.Label(
-            self.init_frame,
+            init_frame,
             text="欢迎使用调试系统\n请选择初始化模式",
             font=("Arial", 18),
             anchor=tk.CENTER
@@ -77,66 +327,67 @@ class DebugLauncher:
         init_label.pack(pady=50)
 
         # 初始化选项按钮
-        btn_frame = ttk.Frame(self.init_frame)
+        btn_frame = ttk.Frame(init_frame)
         btn_frame.pack(pady=20)
 
-        ttk.Button(
-            btn_frame,
-            text="完整初始化",
-            command=self.full_initialize
-        ).pack(side=tk.LEFT, padx=10, ipadx=10, ipady=5)
-
-        ttk.Button(
-            btn_frame,
-            text="仅设备调试",
-            command=self.device_only_initialize
-        ).pack(side=tk.LEFT, padx=10, ipadx=10, ipady=5)
-
-        ttk.Button(
-            btn_frame,
-            text="仅数据库调试",
-            command=self.database_only_initialize
-        ).pack(side=tk.LEFT, padx=10, ipadx=10, ipady=5)
-
-        # 显示状态栏
-        status_bar = ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
-        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
-
-        logger.info("调试启动器界面初始化完成")
+        self._init_buttons = []
+        for text, method in _INIT_BUTTONS:
+            button = ttk.Button(btn_frame, text=text, command=getattr(self, method))
+            button.pack(side=tk.LEFT, padx=10, ipadx=10, ipady=5)
+            self._init_buttons.append(button)
+
+        return init_frame
+
+    def _show_page(self, name, create):
+        """隐藏初始化界面并显示指定页面，页面只在第一次显示时创建
+
+        Args:
+            name: 页面名称
+            create: 创建并pack页面框架的方法，返回页面框架
+        """
+        self.init_frame.pack_forget()
+        if self._current_page is not None:
+            self._current_page.pack_forget()
+
+        page = self._pages.get(name)
+        if page is None:
+            page = create()
+            self._pages[name] = page
+        else:
+            page.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self._current_page = page
 
     def update_status(self, message):
-        """更新状态栏信息"""
+        """更新状态栏信息（界面由事件循环统一重绘，不在这里强制刷新）"""
         self.status_var.set(message)
-        self.root.update_idletasks()
         logger.info(message)
 
     def full_initialize(self):
         """完整初始化所有系统模块"""
         self.update_status("正在完整初始化系统...")
+        self._run_init(self._do_full_initialize)
 
-        # 导入所需模块
+    def _do_full_initialize(self):
+        """完整初始化（在工作线程中执行）"""
+        # 导入所需模块（识别器、任务、账号、状态等模块在打开对应面板时才导入）
         try:
             from data.database_manager import DatabaseManager
             from data.config import Config
             from components.device_controller import AndroidDeviceController
-            from components.screen_recognizer import ScreenRecognizer
-            from components.state_manager import StateManager
-            from schedulers.task_manager import TaskManager
-            from schedulers.account_service import AccountService
 
             # 1. 初始化配置
-            self.update_status("初始化配置...")
+            self._post_status("初始化配置...")
             self.config = Config()
             initialized_modules['Config'] = self.config
 
             # 2. 初始化数据库管理器
-            self.update_status("初始化数据库管理器...")
+            self._post_status("初始化数据库管理器...")
             db_path = self.config.get('database.path', 'automation.db')
             self.db_manager = DatabaseManager(db_path=db_path)
             initialized_modules['DatabaseManager'] = self.db_manager
 
             # 3. 初始化设备控制器
-            self.update_status("初始化设备控制器...")
+            self._post_status("初始化设备控制器...")
             self.device_controller = AndroidDeviceController()
 
             # 显式调用初始化方法
@@ -150,53 +401,56 @@ class DebugLauncher:
             else:
                 logger.warning("设备控制器初始化失败")
                 # 提示用户使用诊断工具
-                messagebox.showwarning("警告", "设备控制器初始化失败，请使用设备诊断工具检查问题")
+                self.root.after(0, messagebox.showwarning, "警告", "设备控制器初始化失败，请使用设备诊断工具检查问题")
 
             initialized_modules['AndroidDeviceController'] = self.device_controller
 
-            # 4. 初始化屏幕识别器
-            self.update_status("初始化屏幕识别器...")
-            self.screen_recognizer = ScreenRecognizer(self.device_controller)
-            initialized_modules['ScreenRecognizer'] = self.screen_recognizer
+            # 4-7. 注册屏幕识别器、任务管理器、账号服务、状态管理器，首次使用时再创建
+            self._post_status("注册延迟加载模块...")
+            db_manager = self.db_manager
+            self._register_screen_recognizer(self.device_controller)
 
-            # 5. 初始化任务管理器
-            self.update_status("初始化任务管理器...")
-            self.task_manager = TaskManager(self.db_manager)
-            initialized_modules['TaskManager'] = self.task_manager
+            def create_task_manager():
+                from schedulers.task_manager import TaskManager
+                return TaskManager(db_manager)
 
-            # 6. 初始化账号服务
-            self.update_status("初始化账号服务...")
-            self.account_service = AccountService(self.db_manager)
-            initialized_modules['AccountService'] = self.account_service
+            def create_account_service():
+                from schedulers.account_service import AccountService
+                return AccountService(db_manager)
 
-            # 7. 初始化状态管理器
-            self.update_status("初始化状态管理器...")
-            self.state_manager = StateManager(self.db_manager, self.screen_recognizer)
-            initialized_modules['StateManager'] = self.state_manager
+            def create_state_manager():
+                from components.state_manager import StateManager
+                return StateManager(db_manager, get_screen_recognizer())
+
+            module_factories['TaskManager'] = create_task_manager
+            module_factories['AccountService'] = create_account_service
+            module_factories['StateManager'] = create_state_manager
 
             # 标记初始化成功
             self.initialized = True
-            self.update_status("系统模块初始化完成")
+            self._post_status("系统模块初始化完成")
 
             # 创建主界面
-            self.init_frame.destroy()
-            self.create_main_frame()
+            self.root.after(0, self._show_page, 'main', self.create_main_frame)
 
         except Exception as e:
-            logger.error(f"完整初始化系统模块时发生错误: {e}", exc_info=True)
-            self.update_status(f"初始化失败: {e}")
+            logger.error("完整初始化系统模块时发生错误: %s", e, exc_info=True)
+            self._post_status(f"初始化失败: {e}")
             # 提示用户
-            messagebox.showerror("错误", f"初始化系统模块失败: {str(e)}")
+            self.root.after(0, messagebox.showerror, "错误", f"初始化系统模块失败: {str(e)}")
 
     def device_only_initialize(self):
         """仅初始化设备调试相关模块"""
         self.update_status("正在初始化设备调试模块...")
+        self._run_init(self._do_device_only_initialize)
 
+    def _do_device_only_initialize(self):
+        """仅初始化设备调试模块（在工作线程中执行）"""
         try:
             from components.device_controller import AndroidDeviceController
 
             # 初始化设备控制器
-            self.update_status("初始化设备控制器...")
+            self._post_status("初始化设备控制器...")
             self.device_controller = AndroidDeviceController()
 
             # 显式调用初始化方法
@@ -209,74 +463,107 @@ class DebugLauncher:
                 logger.info("设备控制器初始化成功")
                 initialized_modules['AndroidDeviceController'] = self.device_controller
 
-                # 尝试初始化屏幕识别器
-                try:
-                    from components.screen_recognizer import ScreenRecognizer
-                    self.update_status("初始化屏幕识别器...")
-                    self.screen_recognizer = ScreenRecognizer(self.device_controller)
-                    initialized_modules['ScreenRecognizer'] = self.screen_recognizer
-                except Exception as e:
-                    logger.error(f"初始化屏幕识别器失败: {e}")
+                # 注册屏幕识别器，打开识别面板时再创建
+                self._register_screen_recognizer(self.device_controller)
 
                 # 标记初始化成功
                 self.initialized = True
-                self.update_status("设备调试模块初始化完成")
+                self._post_status("设备调试模块初始化完成")
 
                 # 创建设备调试界面
-                self.init_frame.destroy()
-                self.create_device_debug_frame()
+                self.root.after(0, self._show_page, 'device', self.create_device_debug_frame)
             else:
                 logger.warning("设备控制器初始化失败")
-                self.update_status("设备控制器初始化失败")
-                # 提示用户
-                messagebox.showwarning("警告", "设备控制器初始化失败，请检查连接或使用设备诊断工具")
-
-                # 显示诊断选项
-                diag_btn = ttk.Button(
-                    self.init_frame,
-                    text="打开设备诊断工具",
-                    command=self.open_device_diagnostic_tool
-                )
-                diag_btn.pack(pady=20)
+                self._post_status("设备控制器初始化失败")
+                # 提示用户并显示诊断选项
+                self.root.after(0, self._show_device_init_failed)
 
         except Exception as e:
-            logger.error(f"初始化设备调试模块时发生错误: {e}", exc_info=True)
-            self.update_status(f"初始化失败: {e}")
+            logger.error("初始化设备调试模块时发生错误: %s", e, exc_info=True)
+            self._post_status(f"初始化失败: {e}")
             # 提示用户
-            messagebox.showerror("错误", f"初始化设备调试模块失败: {str(e)}")
+            self.root.after(0, messagebox.showerror, "错误", f"初始化设备调试模块失败: {str(e)}")
 
     def database_only_initialize(self):
         """仅初始化数据库调试相关模块"""
         self.update_status("正在初始化数据库调试模块...")
+        self._run_init(self._do_database_only_initialize)
 
+    def _do_database_only_initialize(self):
+        """仅初始化数据库调试模块（在工作线程中执行）"""
         try:
             from data.database_manager import DatabaseManager
             from data.config import Config
 
             # 初始化配置
-            self.update_status("初始化配置...")
+            self._post_status("初始化配置...")
             self.config = Config()
             initialized_modules['Config'] = self.config
 
             # 初始化数据库管理器
-            self.update_status("初始化数据库管理器...")
+            self._post_status("初始化数据库管理器...")
             db_path = self.config.get('database.path', 'automation.db')
             self.db_manager = DatabaseManager(db_path=db_path)
             initialized_modules['DatabaseManager'] = self.db_manager
 
             # 标记初始化成功
             self.initialized = True
-            self.update_status("数据库调试模块初始化完成")
+            self._post_status("数据库调试模块初始化完成")
 
             # 创建数据库调试界面
-            self.init_frame.destroy()
-            self.create_database_debug_frame()
+            self.root.after(0, self._show_page, 'database', self.create_database_debug_frame)
 
         except Exception as e:
-            logger.error(f"初始化数据库调试模块时发生错误: {e}", exc_info=True)
-            self.update_status(f"初始化失败: {e}")
+            logger.error("初始化数据库调试模块时发生错误: %s", e, exc_info=True)
+            self._post_status(f"初始化失败: {e}")
             # 提示用户
-            messagebox.showerror("错误", f"初始化数据库调试模块失败: {str(e)}")
+            self.root.after(0, messagebox.showerror, "错误", f"初始化数据库调试模块失败: {str(e)}")
+
+    def _run_init(self, worker):
+        """在后台线程执行初始化，期间禁用初始化按钮，避免界面卡住和重复点击
+
+        Args:
+            worker: 在工作线程中执行的初始化方法
+        """
+        self._set_init_buttons_state(tk.DISABLED)
+
+        def run():
+            try:
+                worker()
+            finally:
+                self.root.after(0, self._set_init_buttons_state, tk.NORMAL)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _set_init_buttons_state(self, state):
+        """设置初始化选项按钮的可用状态"""
+        for button in self._init_buttons:
+            button.config(state=state)
+
+    def _post_status(self, message):
+        """从工作线程更新状态栏（转到主线程执行）"""
+        self.root.after(0, self.update_status, message)
+
+    def _show_device_init_failed(self):
+        """设备控制器初始化失败时提示用户，并显示诊断选项"""
+        messagebox.showwarning("警告", "设备控制器初始化失败，请检查连接或使用设备诊断工具")
+
+        # 初始化界面会保留，诊断按钮只创建一次
+        if self._diag_button is None:
+            self._diag_button = ttk.Button(
+                self.init_frame,
+                text="打开设备诊断工具",
+                command=self.open_device_diagnostic_tool
+            )
+            self._diag_button.pack(pady=20)
+
+    def _register_screen_recognizer(self, device_controller):
+        """注册屏幕识别器工厂函数，首次使用时再导入并创建"""
+        def create_screen_recognizer():
+            from components.screen_recognizer import ScreenRecognizer
+            return ScreenRecognizer(device_controller)
+
+        module_factories['ScreenRecognizer'] = create_screen_recognizer
 
     def create_main_frame(self):
         """创建主调试面板"""
@@ -304,43 +591,31 @@ class DebugLauncher:
         notebook.add(diag_frame, text="诊断工具")
 
         # 设备与识别选项卡内容
-        ttk.Button(device_frame, text="屏幕识别调试",
-                   command=self.open_screen_recognition_panel).pack(pady=10, padx=20, fill=tk.X)
-
-        ttk.Button(device_frame, text="设备控制调试",
-                   command=self.open_device_control_panel).pack(pady=10, padx=20, fill=tk.X)
-
-        ttk.Button(device_frame, text="OCR文本识别调试",
-                   command=self.open_ocr_debug_panel).pack(pady=10, padx=50, fill=tk.X)
-
-        ttk.Button(device_frame, text="设备诊断工具",
-                   command=self.open_device_diagnostic_tool).pack(pady=10, padx=20, fill=tk.X)
+        self._add_buttons(device_frame, _DEVICE_BUTTONS, padx=20)
 
         # 数据库选项卡内容
-        ttk.Button(db_frame, text="数据库查询",
-                   command=self.open_database_panel).pack(pady=10, padx=20, fill=tk.X)
+        self._add_buttons(db_frame, _DATABASE_BUTTONS, padx=20)
 
         # 任务与状态选项卡内容
-        ttk.Button(task_frame, text="状态管理调试",
-                   command=self.open_state_management_panel).pack(pady=10, padx=20, fill=tk.X)
-
-        ttk.Button(task_frame, text="任务管理调试",
-                   command=self.open_task_management_panel).pack(pady=10, padx=20, fill=tk.X)
-
-        ttk.Button(task_frame, text="账号服务调试",
-                   command=self.open_account_service_panel).pack(pady=10, padx=20, fill=tk.X)
+        self._add_buttons(task_frame, _TASK_BUTTONS, padx=20)
 
         # 诊断工具选项卡内容
         ttk.Label(diag_frame, text="系统诊断工具").pack(pady=5)
+        self._add_buttons(diag_frame, _DIAG_BUTTONS, padx=20)
 
-        ttk.Button(diag_frame, text="检查系统状态",
-                   command=self.check_system_status).pack(pady=10, padx=20, fill=tk.X)
+        return main_frame
 
-        ttk.Button(diag_frame, text="重新初始化系统",
-                   command=self.reinitialize_system).pack(pady=10, padx=20, fill=tk.X)
+    def _add_buttons(self, parent, buttons, padx):
+        """按布局表创建一列按钮
 
-        ttk.Button(diag_frame, text="查看系统日志",
-                   command=self.view_system_logs).pack(pady=10, padx=20, fill=tk.X)
+        Args:
+            parent: 父容器
+            buttons: (按钮文字, 处理方法名) 元组序列
+            padx: 水平边距
+        """
+        for text, method in buttons:
+            ttk.Button(parent, text=text, command=getattr(self, method)).pack(
+                pady=10, padx=padx, fill=tk.X)
 
     def open_ocr_debug_panel(self):
         """打开OCR调试面板"""
@@ -350,6 +625,10 @@ class DebugLauncher:
             messagebox.showerror("错误", "设备控制器未初始化，无法打开OCR调试面板")
             return
 
+        # 窗口已创建过则直接显示，保留面板中的状态
+        if self._show_panel_window('ocr'):
+            return
+
         try:
             # 导入OCR调试面板
             from debug.ocr_debug_tool import OCRDebugPanel
@@ -367,11 +646,12 @@ class DebugLauncher:
             # 创建OCR调试面板
             ocr_debug_panel = OCRDebugPanel(
                 ocr_window,
-                initialized_modules['ScreenRecognizer'],
+                get_module('ScreenRecognizer'),
                 screen_panel
             )
             ocr_debug_panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
+            self._remember_panel_window('ocr', ocr_window)
             self.update_status("OCR调试面板已打开")
 
         except ModuleNotFoundError:
@@ -379,7 +659,7 @@ class DebugLauncher:
             self.update_status("OCR调试面板模块不存在")
             messagebox.showerror("错误", "OCR调试面板模块不存在")
         except Exception as e:
-            logger.error(f"打开OCR调试面板时发生错误: {e}", exc_info=True)
+            logger.error("打开OCR调试面板时发生错误: %s", e, exc_info=True)
             self.update_status(f"打开OCR调试面板失败: {e}")
             messagebox.showerror("错误", f"打开OCR调试面板失败: {str(e)}")
 
@@ -392,17 +672,7 @@ class DebugLauncher:
         ttk.Label(device_frame, text="设备调试面板", font=("Arial", 16)).pack(pady=10)
 
         # 功能按钮
-        ttk.Button(device_frame, text="屏幕识别调试",
-                   command=self.open_screen_recognition_panel).pack(pady=10, padx=50, fill=tk.X)
-
-        ttk.Button(device_frame, text="设备控制调试",
-                   command=self.open_device_control_panel).pack(pady=10, padx=50, fill=tk.X)
-
-        ttk.Button(device_frame, text="OCR文本识别调试",
-                   command=self.open_ocr_debug_panel).pack(pady=10, padx=20, fill=tk.X)
-
-        ttk.Button(device_frame, text="设备诊断工具",
-                   command=self.open_device_diagnostic_tool).pack(pady=10, padx=50, fill=tk.X)
+        self._add_buttons(device_frame, _DEVICE_BUTTONS, padx=50)
 
         # 分隔线
         ttk.Separator(device_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, padx=50, pady=20)
@@ -411,6 +681,8 @@ class DebugLauncher:
         ttk.Button(device_frame, text="返回初始化选择",
                    command=self.back_to_init).pack(pady=10, padx=50)
 
+        return device_frame
+
     def create_database_debug_frame(self):
         """创建数据库调试专用面板"""
         db_frame = ttk.Frame(self.root)
@@ -420,8 +692,7 @@ class DebugLauncher:
         ttk.Label(db_frame, text="数据库调试面板", font=("Arial", 16)).pack(pady=10)
 
         # 功能按钮
-        ttk.Button(db_frame, text="数据库查询",
-                   command=self.open_database_panel).pack(pady=10, padx=50, fill=tk.X)
+        self._add_buttons(db_frame, _DATABASE_BUTTONS, padx=50)
 
         # 分隔线
         ttk.Separator(db_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, padx=50, pady=20)
@@ -430,52 +701,53 @@ class DebugLauncher:
         ttk.Button(db_frame, text="返回初始化选择",
                    command=self.back_to_init).pack(pady=10, padx=50)
 
+        return db_frame
+
     def back_to_init(self):
         """返回初始化选择界面"""
-        # 清除当前界面
+        # 关闭所有打开的调试面板窗口
         for widget in self.root.winfo_children():
-            widget.destroy()
+            if isinstance(widget, tk.Toplevel):
+                widget.destroy()
+        self._panel_windows.clear()
 
-        # 重新创建初始化界面
-        self.init_frame = ttk.Frame(self.root)
-        self.init_frame.pack(fill=tk.BOTH, expand=True)
+        # 隐藏当前页面，重新显示初始化界面
+        if self._current_page is not None:
+            self._current_page.pack_forget()
+            self._current_page = None
+        self.init_frame.pack(fill=tk.BOTH, expand=True, before=self.status_bar)
 
-        init_label = ttk.Label(
-            self.init_frame,
-            text="欢迎使用调试系统\n请选择初始化模式",
-            font=("Arial", 18),
-            anchor=tk.CENTER
-        )
-        init_label.pack(pady=50)
+        # 更新状态
+        self.update_status("已返回初始化选择界面")
 
-        # 初始化选项按钮
-        btn_frame = ttk.Frame(self.init_frame)
-        btn_frame.pack(pady=20)
+    def _show_panel_window(self, key):
+        """显示已创建的调试面板窗口
 
-        ttk.Button(
-            btn_frame,
-            text="完整初始化",
-            command=self.full_initialize
-        ).pack(side=tk.LEFT, padx=10, ipadx=10, ipady=5)
+        Args:
+            key: 面板名
 
-        ttk.Button(
-            btn_frame,
-            text="仅设备调试",
-            command=self.device_only_initialize
-        ).pack(side=tk.LEFT, padx=10, ipadx=10, ipady=5)
+        Returns:
+            窗口存在并已显示时返回True，否则返回False
+        """
+        window = self._panel_windows.get(key)
+        if window is None or not window.winfo_exists():
+            self._panel_windows.pop(key, None)
+            return False
 
-        ttk.Button(
-            btn_frame,
-            text="仅数据库调试",
-            command=self.database_only_initialize
-        ).pack(side=tk.LEFT, padx=10, ipadx=10, ipady=5)
+        window.deiconify()
+        window.lift()
+        self.update_status("调试面板已显示")
+        return True
 
-        # 显示状态栏
-        status_bar = ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
-        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+    def _remember_panel_window(self, key, window):
+        """记录调试面板窗口，关闭时只隐藏窗口
 
-        # 更新状态
-        self.update_status("已返回初始化选择界面")
+        Args:
+            key: 面板名
+            window: 面板所在的Toplevel窗口
+        """
+        window.protocol("WM_DELETE_WINDOW", window.withdraw)
+        self._panel_windows[key] = window
 
     def open_screen_recognition_panel(self):
         """打开屏幕识别调试面板"""
@@ -485,6 +757,10 @@ class DebugLauncher:
             messagebox.showerror("错误", "设备控制器未初始化，无法打开屏幕识别调试面板")
             return
 
+        # 窗口已创建过则直接显示，保留面板中的状态
+        if self._show_panel_window('recognition'):
+            return
+
         try:
             from debug.screen_panel import ScreenPanel
             from debug.recognition_panel import RecognitionPanel
@@ -499,18 +775,20 @@ class DebugLauncher:
             screen_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
             # 如果有屏幕识别器，则创建识别面板
-            if 'ScreenRecognizer' in initialized_modules:
+            screen_recognizer = get_screen_recognizer()
+            if screen_recognizer is not None:
                 recognition_panel = RecognitionPanel(
                     recognition_window,
-                    initialized_modules['ScreenRecognizer'],
+                    screen_recognizer,
                     screen_panel
                 )
                 recognition_panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
+            self._remember_panel_window('recognition', recognition_window)
             self.update_status("屏幕识别调试面板已打开")
 
         except Exception as e:
-            logger.error(f"打开屏幕识别调试面板时发生错误: {e}", exc_info=True)
+            logger.error("打开屏幕识别调试面板时发生错误: %s", e, exc_info=True)
             self.update_status(f"打开屏幕识别调试面板失败: {e}")
             messagebox.showerror("错误", f"打开屏幕识别调试面板失败: {str(e)}")
 
@@ -522,6 +800,10 @@ class DebugLauncher:
             messagebox.showerror("错误", "设备控制器未初始化，无法打开设备控制调试面板")
             return
 
+        # 窗口已创建过则直接显示，保留面板中的状态
+        if self._show_panel_window('device'):
+            return
+
         try:
             # 导入设备控制面板模块
             # 注意：这个模块需要先创建
@@ -537,6 +819,7 @@ class DebugLauncher:
             )
             device_panel.pack(fill=tk.BOTH, expand=True)
 
+            self._remember_panel_window('device', device_window)
             self.update_status("设备控制调试面板已打开")
 
         except ModuleNotFoundError:
@@ -544,7 +827,7 @@ class DebugLauncher:
             self.update_status("设备控制面板模块不存在")
             messagebox.showerror("错误", "设备控制面板模块不存在，请先创建该模块")
         except Exception as e:
-            logger.error(f"打开设备控制调试面板时发生错误: {e}", exc_info=True)
+            logger.error("打开设备控制调试面板时发生错误: %s", e, exc_info=True)
             self.update_status(f"打开设备控制调试面板失败: {e}")
             messagebox.showerror("错误", f"打开设备控制调试面板失败: {str(e)}")
 
@@ -567,7 +850,7 @@ class DebugLauncher:
             self.update_status("设备诊断工具模块不存在")
             messagebox.showerror("错误", "设备诊断工具模块不存在，请先创建该模块")
         except Exception as e:
-            logger.error(f"打开设备诊断工具时发生错误: {e}", exc_info=True)
+            logger.error("打开设备诊断工具时发生错误: %s", e, exc_info=True)
             self.update_status(f"打开设备诊断工具失败: {e}")
             messagebox.showerror("错误", f"打开设备诊断工具失败: {str(e)}")
 
@@ -590,17 +873,21 @@ class DebugLauncher:
             self.update_status("数据库查询面板已打开")
 
         except Exception as e:
-            logger.error(f"打开数据库查询面板时发生错误: {e}", exc_info=True)
+            logger.error("打开数据库查询面板时发生错误: %s", e, exc_info=True)
             self.update_status(f"打开数据库查询面板失败: {e}")
             messagebox.showerror("错误", f"打开数据库查询面板失败: {str(e)}")
     def open_state_management_panel(self):
         """打开状态管理调试面板"""
         self.update_status("正在打开状态管理调试面板...")
 
-        if 'StateManager' not in initialized_modules:
+        if not has_module('StateManager'):
             messagebox.showerror("错误", "状态管理器未初始化，无法打开状态管理调试面板")
             return
 
+        # 窗口已创建过则直接显示，保留面板中的状态
+        if self._show_panel_window('state'):
+            return
+
         try:
             from debug.state_panel import StateManagementPanel
 
@@ -610,15 +897,16 @@ class DebugLauncher:
 
             state_panel = StateManagementPanel(
                 state_window,
-                initialized_modules['StateManager'],
-                initialized_modules.get('ScreenRecognizer')
+                get_module('StateManager'),
+                get_screen_recognizer()
             )
             state_panel.pack(fill=tk.BOTH, expand=True)
 
+            self._remember_panel_window('state', state_window)
             self.update_status("状态管理调试面板已打开")
 
         except Exception as e:
-            logger.error(f"打开状态管理调试面板时发生错误: {e}", exc_info=True)
+            logger.error("打开状态管理调试面板时发生错误: %s", e, exc_info=True)
             self.update_status(f"打开状态管理调试面板失败: {e}")
             messagebox.showerror("错误", f"打开状态管理调试面板失败: {str(e)}")
 
@@ -626,10 +914,14 @@ class DebugLauncher:
         """打开任务管理调试面板"""
         self.update_status("正在打开任务管理调试面板...")
 
-        if 'TaskManager' not in initialized_modules:
+        if not has_module('TaskManager'):
             messagebox.showerror("错误", "任务管理器未初始化，无法打开任务管理调试面板")
             return
 
+        # 窗口已创建过则直接显示，保留面板中的状态
+        if self._show_panel_window('task'):
+            return
+
         try:
             # 导入任务管理面板模块
             # 注意：这个模块可能需要先创建
@@ -641,10 +933,11 @@ class DebugLauncher:
 
             task_panel = TaskManagementPanel(
                 task_window,
-                initialized_modules['TaskManager']
+                get_module('TaskManager')
             )
             task_panel.pack(fill=tk.BOTH, expand=True)
 
+            self._remember_panel_window('task', task_window)
             self.update_status("任务管理调试面板已打开")
 
         except ModuleNotFoundError:
@@ -652,7 +945,7 @@ class DebugLauncher:
             self.update_status("任务管理面板模块不存在")
             messagebox.showerror("错误", "任务管理面板模块不存在，请先创建该模块")
         except Exception as e:
-            logger.error(f"打开任务管理调试面板时发生错误: {e}", exc_info=True)
+            logger.error("打开任务管理调试面板时发生错误: %s", e, exc_info=True)
             self.update_status(f"打开任务管理调试面板失败: {e}")
             messagebox.showerror("错误", f"打开任务管理调试面板失败: {str(e)}")
 
@@ -660,10 +953,14 @@ class DebugLauncher:
         """打开账号服务调试面板"""
         self.update_status("正在打开账号服务调试面板...")
 
-        if 'AccountService' not in initialized_modules:
+        if not has_module('AccountService'):
             messagebox.showerror("错误", "账号服务未初始化，无法打开账号服务调试面板")
             return
 
+        # 窗口已创建过则直接显示，保留面板中的状态
+        if self._show_panel_window('account'):
+            return
+
         try:
             # 导入账号服务面板模块
             # 注意：这个模块可能需要先创建
@@ -675,10 +972,11 @@ class DebugLauncher:
 
             account_panel = AccountServicePanel(
                 account_window,
-                initialized_modules['AccountService']
+                get_module('AccountService')
             )
             account_panel.pack(fill=tk.BOTH, expand=True)
 
+            self._remember_panel_window('account', account_window)
             self.update_status("账号服务调试面板已打开")
 
         except ModuleNotFoundError:
@@ -686,7 +984,7 @@ class DebugLauncher:
             self.update_status("账号服务面板模块不存在")
             messagebox.showerror("错误", "账号服务面板模块不存在，请先创建该模块")
         except Exception as e:
-            logger.error(f"打开账号服务调试面板时发生错误: {e}", exc_info=True)
+            logger.error("打开账号服务调试面板时发生错误: %s", e, exc_info=True)
             self.update_status(f"打开账号服务调试面板失败: {e}")
             messagebox.showerror("错误", f"打开账号服务调试面板失败: {str(e)}")
 
@@ -711,81 +1009,118 @@ class DebugLauncher:
 
         scroll.config(command=status_text.yview)
 
-        # 显示系统状态
-        status_text.insert(tk.END, "=== 系统状态检查 ===\n\n")
+        # 显示系统状态（先收集所有内容，最后一次性写入文本框）
+        parts = ["=== 系统状态检查 ===\n\n"]
 
         # 检查已初始化的模块
-        status_text.insert(tk.END, "已初始化的模块:\n")
+        parts.append("已初始化的模块:\n")
         for module_name, module in initialized_modules.items():
             status = "正常" if hasattr(module, 'is_initialized') and module.is_initialized else "异常"
-            status_text.insert(tk.END, f"- {module_name}: {status}\n")
+            parts.append(f"- {module_name}: {status}\n")
+        for module_name in module_factories:
+            parts.append(f"- {module_name}: 未加载\n")
 
         # 检查Python版本
-        status_text.insert(tk.END, f"\nPython版本: {sys.version}\n")
+        parts.append(f"\nPython版本: {sys.version}\n")
 
         # 检查系统平台
-        status_text.insert(tk.END, f"系统平台: {sys.platform}\n")
+        parts.append(f"系统平台: {sys.platform}\n")
 
         # 检查项目目录
-        status_text.insert(tk.END, f"项目根目录: {project_root}\n")
+        parts.append(f"项目根目录: {project_root}\n")
 
         # 检查日志目录
-        status_text.insert(tk.END, f"日志目录: {logs_dir}\n")
+        parts.append(f"日志目录: {logs_dir}\n")
 
         # 检查数据库
         if 'DatabaseManager' in initialized_modules:
             db_manager = initialized_modules['DatabaseManager']
             if hasattr(db_manager, 'db_path'):
-                status_text.insert(tk.END, f"数据库路径: {db_manager.db_path}\n")
+                parts.append(f"数据库路径: {db_manager.db_path}\n")
 
                 # 尝试获取表信息
                 try:
                     query = "SELECT name FROM sqlite_master WHERE type='table'"
                     tables = db_manager.fetch_all(query)
-                    status_text.insert(tk.END, f"数据库表数量: {len(tables)}\n")
-                    status_text.insert(tk.END, "表列表:\n")
+                    parts.append(f"数据库表数量: {len(tables)}\n")
+                    parts.append("表列表:\n")
                     for table in tables:
-                        status_text.insert(tk.END, f"- {table['name']}\n")
+                        parts.append(f"- {table['name']}\n")
                 except Exception as e:
-                    status_text.insert(tk.END, f"获取表信息失败: {e}\n")
+                    parts.append(f"获取表信息失败: {e}\n")
 
         # 检查设备信息
+        check_adb = False
         if 'AndroidDeviceController' in initialized_modules:
             device = initialized_modules['AndroidDeviceController']
-            status_text.insert(tk.END, "\n设备信息:\n")
+            parts.append("\n设备信息:\n")
             if hasattr(device, 'is_initialized') and device.is_initialized:
-                status_text.insert(tk.END, "设备已初始化\n")
+                parts.append("设备已初始化\n")
 
-                # 尝试获取设备信息
-                try:
-                    import subprocess
-                    result = subprocess.run(['adb', 'devices'], capture_output=True, text=True, check=False)
-                    status_text.insert(tk.END, f"ADB设备列表:\n{result.stdout}\n")
-                except Exception as e:
-                    status_text.insert(tk.END, f"获取ADB设备信息失败: {e}\n")
+                # 设备信息稍后在后台线程中获取
+                check_adb = True
             else:
-                status_text.insert(tk.END, "设备未初始化\n")
+                parts.append("设备未初始化\n")
 
         # 检查任务信息
         if 'TaskManager' in initialized_modules:
             task_manager = initialized_modules['TaskManager']
-            status_text.insert(tk.END, "\n任务管理信息:\n")
+            parts.append("\n任务管理信息:\n")
 
             # 尝试获取任务列表
             try:
                 if hasattr(task_manager, 'get_task_list'):
                     tasks = task_manager.get_task_list()
-                    status_text.insert(tk.END, f"任务数量: {len(tasks)}\n")
-                    status_text.insert(tk.END, "任务列表:\n")
+                    parts.append(f"任务数量: {len(tasks)}\n")
+                    parts.append("任务列表:\n")
                     for task in tasks:
                         task_id = task.get('task_id', 'unknown')
                         task_name = task.get('name', 'unknown')
-                        status_text.insert(tk.END, f"- {task_name} (ID: {task_id})\n")
+                        parts.append(f"- {task_name} (ID: {task_id})\n")
             except Exception as e:
-                status_text.insert(tk.END, f"获取任务信息失败: {e}\n")
+                parts.append(f"获取任务信息失败: {e}\n")
+
+        status_text.insert(tk.END, "".join(parts))
+
+        # adb启动较慢，10秒内的结果直接使用缓存，否则先显示旧结果，再在后台线程刷新
+        if check_adb:
+            cached = self._adb_cache
+            if cached is not None and time.time() - cached[0] < 10:
+                status_text.insert(tk.END, "\n" + cached[1])
+            else:
+                if cached is not None:
+                    status_text.insert(tk.END, f"\n(缓存) {cached[1]}")
+                status_text.insert(tk.END, "\n正在获取ADB设备列表...\n")
+                self._refresh_adb_devices(status_window, status_text)
 
         self.update_status("系统状态检查完成")
 
+    def _refresh_adb_devices(self, status_window, status_text):
+        """在后台线程获取adb设备列表，完成后更新缓存并追加到状态文本框
+
+        Args:
+            status_window: 系统状态窗口
+            status_text: 状态文本框
+        """
+        def append_adb_result(text):
+            self._adb_cache = (time.time(), text)
+            if status_text.winfo_exists():
+                status_text.insert(tk.END, text)
+
+        def query_adb_devices():
+            try:
+                result = subprocess.run(['adb', 'devices'], capture_output=True, text=True, check=False)
+                text = f"ADB设备列表:\n{result.stdout}\n"
+            except Exception as e:
+                text = f"获取ADB设备信息失败: {e}\n"
+            try:
+                status_window.after(0, append_adb_result, text)
+            except (RuntimeError, tk.TclError):
+                # 状态窗口已关闭
+                pass
+
+        threading.Thread(target=query_adb_devices, daemon=True).start()
+
     def reinitialize_system(self):
         """重新初始化系统"""
         if messagebox.askyesno("确认", "确定要重新初始化系统吗？这将关闭所有打开的调试面板。"):
@@ -793,6 +1128,7 @@ class DebugLauncher:
 
             # 清空已初始化的模块
             initialized_modules.clear()
+            module_factories.clear()
 
             # 返回初始化选择界面
             self.back_to_init()
@@ -814,36 +1150,90 @@ class DebugLauncher:
         ttk.Label(select_frame, text="选择日志文件:").pack(side=tk.LEFT, padx=5)
 
         # 获取所有日志文件
-        log_files = []
-        try:
-            for file in os.listdir(logs_dir):
-                if file.endswith(".log"):
-                    log_files.append(file)
-        except:
-            log_files = []
-
-        # 添加系统默认日志
-        system_logs = ['system.log', 'database.log', 'screen_recognizer.log', 'state_manager.log']
-        for log in system_logs:
-            log_path = os.path.join(project_root, log)
-            if os.path.exists(log_path):
-                log_files.append(log_path)
+        log_files = self._list_log_files()
 
         # 创建下拉选择框
-        self.log_file_var = tk.StringVar()
-        log_combo = ttk.Combobox(select_frame, textvariable=self.log_file_var, width=50)
+        log_file_var = tk.StringVar(log_viewer)
+        log_combo = ttk.Combobox(select_frame, textvariable=log_file_var, width=50)
         log_combo['values'] = log_files
         if log_files:
             log_combo.current(0)
         log_combo.pack(side=tk.LEFT, padx=5)
 
+        # 默认只加载日志末尾，勾选后加载完整文件
+        log_full_var = tk.BooleanVar(log_viewer, value=False)
+
+        def tail_bytes():
+            return None if log_full_var.get() else LOG_TAIL_BYTES
+
+        # 本查看器的显示状态：自己加载日志的文本框，或共享其他查看器文本框内容的peer
+        view = {'text': None, 'peer': None, 'master': None}
+
+        def set_text(master=None):
+            """换用新的文本框，master不为None时创建共享其内容的peer"""
+            if view['text'] is not None:
+                view['text'].destroy()
+            if view['peer'] is not None:
+                log_viewer.tk.call('destroy', view['peer'])
+            view.update(text=None, peer=None, master=None)
+
+            if master is None:
+                # 日志只读，不需要撤销记录
+                text = tk.Text(log_frame, wrap=tk.NONE, undo=False,
+                               xscrollcommand=x_scroll_set, yscrollcommand=y_scroll_set)
+                text.pack(fill=tk.BOTH, expand=True)
+                path = str(text)
+                view['text'] = text
+            else:
+                # 滚动回调已注册在本查看器窗口上，原文本框关闭后peer仍可滚动
+                path = f"{log_frame}.peer"
+                master.peer_create(path, wrap=tk.NONE, state='disabled',
+                                   xscrollcommand=x_scroll_set, yscrollcommand=y_scroll_set)
+                log_viewer.tk.call('pack', path, '-fill', 'both', '-expand', 1)
+                view.update(peer=path, master=master)
+            y_scroll.config(command=lambda *args: log_viewer.tk.call(path, 'yview', *args))
+            x_scroll.config(command=lambda *args: log_viewer.tk.call(path, 'xview', *args))
+
+        def load():
+            key = (log_file_var.get(), tail_bytes())
+            # 其他查看器已完整加载同一文件时直接共享其内容
+            master = self._log_master(key)
+            if master is not None and master is not view['text']:
+                if view['master'] is not master:
+                    set_text(master)
+                return
+
+            # 自己的文本框可能正被其他查看器以另一文件共享，换一个新的文本框；
+            # 已显示大量内容时同样换新，销毁整个文本框比删除全部内容快得多
+            text = view['text']
+            if text is None or any(v is text for k, v in self._log_masters.items() if k != key) \
+                    or self._loaded_log_bytes(text) > LOG_SWAP_BYTES:
+                set_text()
+            self.load_log_file(key[0], view['text'], key[1])
+            self._log_masters[key] = view['text']
+
         # 加载按钮
-        ttk.Button(select_frame, text="加载",
-                   command=lambda: self.load_log_file(self.log_file_var.get(), log_text)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(select_frame, text="加载", command=load).pack(side=tk.LEFT, padx=5)
+
+        # 刷新按钮（同时重新扫描日志文件列表）
+        def refresh():
+            log_combo['values'] = self._list_log_files(force=True)
+            key = (log_file_var.get(), tail_bytes())
+            # 共享内容时通过原文本框增量刷新；切换了文件或原文本框已关闭时重新加载
+            text = view['text'] or view['master']
+            if text is None or self._log_masters.get(key) is not text or \
+                    (view['master'] is not None and self._log_master(key) is None):
+                load()
+                return
+            if view['text'] is None:
+                # 文件轮转时在原文本框中重新加载，所有peer同步显示
+                self.refresh_log_file(key[0], text, key[1], reload=lambda: self.load_log_file(key[0], text, key[1]))
+            else:
+                self.refresh_log_file(key[0], text, key[1], reload=load)
 
-        # 刷新按钮
-        ttk.Button(select_frame, text="刷新",
-                   command=lambda: self.refresh_log_file(self.log_file_var.get(), log_text)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(select_frame, text="刷新", command=refresh).pack(side=tk.LEFT, padx=5)
+
+        ttk.Checkbutton(select_frame, text="加载完整文件", variable=log_full_var).pack(side=tk.LEFT, padx=5)
 
         # 日志显示区域
         log_frame = ttk.Frame(log_viewer)
@@ -856,102 +1246,375 @@ class DebugLauncher:
         x_scroll = ttk.Scrollbar(log_frame, orient=tk.HORIZONTAL)
         x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
 
-        log_text = tk.Text(log_frame, wrap=tk.NONE, xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set)
-        log_text.pack(fill=tk.BOTH, expand=True)
+        # 文本框和peer共用的滚动条回调，随本查看器窗口一起释放
+        x_scroll_set = log_viewer.register(x_scroll.set)
+        y_scroll_set = log_viewer.register(y_scroll.set)
 
-        y_scroll.config(command=log_text.yview)
-        x_scroll.config(command=log_text.xview)
+        set_text()
 
         # 如果有选中的日志文件，自动加载
         if log_files:
-            self.load_log_file(self.log_file_var.get(), log_text)
+            load()
 
         self.update_status("系统日志查看器已打开")
 
+    def _loaded_log_bytes(self, text_widget):
+        """获取文本框中已加载的日志字节数
+
+        Args:
+            text_widget: 显示日志的文本框
+
+        Returns:
+            int: 已加载的字节数，未加载完成时返回0
+        """
+        state = self._log_state.get(str(text_widget))
+        if state is None:
+            return 0
+        _, tail_bytes, _, size = state
+        return size if tail_bytes is None else min(size, tail_bytes)
+
+    def _log_master(self, key):
+        """获取已完整加载指定日志、可共享内容的文本框
+
+        Args:
+            key: (日志文件, 末尾字节数)
+
+        Returns:
+            tk.Text: 可共享的文本框，没有或仍在加载时返回None
+        """
+        text = self._log_masters.get(key)
+        if text is None:
+            return None
+        try:
+            if not text.winfo_exists():
+                raise tk.TclError
+        except tk.TclError:
+            del self._log_masters[key]
+            return None
+        name = str(text)
+        if name in self._log_loads or name not in self._log_state:
+            return None
+        return text
+
+    def _list_log_files(self, force=False):
+        """获取可查看的日志文件列表，5秒内重复打开直接使用缓存
+
+        Args:
+            force: 是否忽略缓存重新扫描
+
+        Returns:
+            日志文件列表（日志目录中的文件名和项目根目录下日志的完整路径）
+        """
+        if not force and self._log_file_cache is not None:
+            scanned_at, files = self._log_file_cache
+            if time.time() - scanned_at < 5:
+                return files
+
+        # 每个目录只读取一次，不再逐个检查固定的系统日志文件名
+        log_files = []
+        try:
+            log_files.extend(path.name for path in Path(logs_dir).glob('*.log'))
+            log_files.extend(str(path) for path in Path(project_root).glob('*.log'))
+        except OSError as e:
+            logger.warning("扫描日志目录失败: %s", e)
+
+        self._log_file_cache = (time.time(), log_files)
+        return log_files
+
     def install_dependencies(self):
         """安装必要的依赖"""
+        if self._deps_verified:
+            self.update_status("依赖已验证")
+            return
+        if self._deps_installing:
+            self.update_status("依赖正在安装中...")
+            return
+
         self.update_status("正在检查并安装依赖...")
 
-        try:
-            import subprocess
-            import sys
+        # 先检查全部依赖，再一次性安装缺失的包，只启动一次pip
+        # find_spec只查找模块，不执行模块代码；包名和模块名不一定相同
+        missing = [dep for dep, module in DEPENDENCY_MODULES.items()
+                   if find_spec(module) is None]
 
-            # 检查和安装EasyOCR
+        if not missing:
+            self.update_status("所有依赖已安装")
+            messagebox.showinfo("成功", "所有依赖已成功安装")
+            self._deps_verified = True
+            return
+
+        # pip在后台线程中运行，安装期间界面保持响应
+        self._deps_installing = True
+        self.update_status(f"正在安装{', '.join(missing)}...")
+
+        def run():
             try:
-                import easyocr
-                self.update_status("EasyOCR已安装")
-            except ImportError:
-                self.update_status("正在安装EasyOCR...")
-                subprocess.check_call([sys.executable, "-m", "pip", "install", "easyocr"])
-                self.update_status("EasyOCR安装成功")
-
-            # 检查其他依赖
-            dependencies = ["numpy", "opencv-python", "pytesseract", "pillow"]
-            for dep in dependencies:
-                try:
-                    __import__(dep.replace("-", "_"))
-                except ImportError:
-                    self.update_status(f"正在安装{dep}...")
-                    subprocess.check_call([sys.executable, "-m", "pip", "install", dep])
-                    self.update_status(f"{dep}安装成功")
+                _pip_install(["--prefer-binary", "--disable-pip-version-check", "wheel", *missing])
+                error = None
+            except Exception as e:
+                error = e
+            self.root.after(0, self._on_dependencies_installed, missing, error)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _on_dependencies_installed(self, missing, error):
+        """后台安装依赖完成后在主线程显示结果
+
+        Args:
+            missing: 安装的包名列表
+            error: 安装失败时的异常，成功时为None
+        """
+        self._deps_installing = False
+        if error is not None:
+            self.update_status(f"安装依赖失败: {error}")
+            messagebox.showerror("错误", f"安装依赖失败: {str(error)}")
+            return
 
-            messagebox.showinfo("成功", "所有依赖已成功安装")
+        self.update_status(f"{', '.join(missing)}安装成功")
+        messagebox.showinfo("成功", "所有依赖已成功安装")
+        self._deps_verified = True
 
-        except Exception as e:
-            self.update_status(f"安装依赖失败: {e}")
-            messagebox.showerror("错误", f"安装依赖失败: {str(e)}")
+    def load_log_file(self, log_file, text_widget, tail_bytes=LOG_TAIL_BYTES):
+        """加载日志文件内容
 
-    def load_log_file(self, log_file, text_widget):
-        """加载日志文件内容"""
+        Args:
+            log_file: 日志文件名或路径
+            text_widget: 显示日志的文本框
+            tail_bytes: 只加载文件末尾的字节数，None表示加载完整文件
+        """
         if not log_file:
             messagebox.showinfo("提示", "请选择要查看的日志文件")
             return
 
-        # 确定日志文件路径
-        log_path = log_file
-        if not os.path.isabs(log_path):
-            log_path = os.path.join(logs_dir, log_file)
+        opened = self._open_log_file(log_file)
+        if opened is None:
+            return
+
+        # 在后台线程读取，避免大文件阻塞界面
+        log_path, f = opened
+        self._load_log_async(log_path, f, text_widget, tail_bytes)
+
+    def _open_log_file(self, log_file):
+        """以二进制方式打开日志文件，依次在日志目录和项目根目录查找
+
+        直接尝试打开，不预先检查文件是否存在，省去多余的stat调用。
+
+        Args:
+            log_file: 日志文件名或路径
+
+        Returns:
+            tuple: (日志文件完整路径, 文件对象)，文件不存在时提示错误并返回None
+        """
+        if os.path.isabs(log_file):
+            candidates = (log_file,)
+        else:
+            candidates = (os.path.join(logs_dir, log_file), os.path.join(project_root, log_file))
 
-        if not os.path.exists(log_path):
-            # 尝试在项目根目录查找
-            log_path = os.path.join(project_root, log_file)
-            if not os.path.exists(log_path):
-                messagebox.showerror("错误", f"日志文件不存在: {log_file}")
+        for log_path in candidates:
+            try:
+                return log_path, open(log_path, 'rb')
+            except FileNotFoundError:
+                continue
+
+        messagebox.showerror("错误", f"日志文件不存在: {log_file}")
+        return None
+
+    def _load_log_async(self, log_path, log_fp, text_widget, tail_bytes):
+        """在后台线程读取日志文件，主线程定时从有界队列取出文本块插入文本框
+
+        同一文本框再次加载时会取消尚未完成的上一次加载。
+
+        Args:
+            log_path: 日志文件完整路径
+            log_fp: 已打开的日志文件对象，读取完成后由后台线程关闭
+            text_widget: 显示日志的文本框
+            tail_bytes: 只加载文件末尾的字节数，None表示加载完整文件
+        """
+        key = str(text_widget)
+        previous = self._log_loads.get(key)
+        if previous is not None:
+            previous.set()
+
+        cancel = threading.Event()
+        self._log_loads[key] = cancel
+        self._log_state.pop(key, None)
+        chunks = queue.Queue(maxsize=8)
+        # 加载时的文件状态，加载完成后供刷新判断是否变化
+        loaded = {}
+
+        # 加载期间才允许编辑，结束后恢复只读；插入时不生成撤销分隔
+        autoseparators = text_widget.cget('autoseparators')
+        text_widget.configure(state='normal', autoseparators=False)
+        text_widget.delete(1.0, tk.END)
+        text_widget.mark_set('insert', 'end')
+
+        def put(item):
+            """放入队列，队列满时等待，加载被取消时返回False"""
+            while not cancel.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def read_worker():
+            try:
+                # 内存映射后按块解码，不一次性读入整个文件
+                with log_fp as f:
+                    st = os.fstat(f.fileno())
+                    loaded['state'] = (log_path, tail_bytes, st.st_mtime_ns, st.st_size)
+                    if st.st_size > 0:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            # 大文件只加载末尾部分，从下一个完整行开始，文件开头的页不会被读入
+                            start = 0
+                            if tail_bytes is not None and len(mm) > tail_bytes:
+                                start = mm.find(b'\n', len(mm) - tail_bytes) + 1
+                                put(f"... 仅显示最后 {tail_bytes >> 20} MB，勾选\"加载完整文件\"查看全部 ...\n")
+
+                            for chunk in _iter_log_chunks(mm, start):
+                                if not put(chunk):
+                                    return
+                put(None)
+            except Exception as e:
+                put(e)
+
+        def finish():
+            text_widget.configure(state='disabled', autoseparators=autoseparators)
+            if self._log_loads.get(key) is cancel:
+                del self._log_loads[key]
+
+        def pump():
+            if cancel.is_set():
                 return
+            try:
+                for _ in range(4):
+                    item = chunks.get_nowait()
+                    if item is None:
+                        # 全部插入后只滚动一次
+                        text_widget.see(tk.END)
+                        finish()
+                        if 'state' in loaded:
+                            self._log_state[key] = loaded['state']
+                        return
+                    if isinstance(item, Exception):
+                        logger.error("加载日志文件时发生错误: %s", item)
+                        finish()
+                        messagebox.showerror("错误", f"加载日志文件失败: {str(item)}")
+                        return
+                    text_widget.insert(tk.END, item)
+            except queue.Empty:
+                pass
+            except tk.TclError:
+                # 查看器窗口已关闭
+                cancel.set()
+                return
+            text_widget.after(30, pump)
 
-        try:
-            # 清除当前内容
-            text_widget.delete(1.0, tk.END)
+        threading.Thread(target=read_worker, daemon=True).start()
+        text_widget.after(30, pump)
 
-            # 加载日志文件
-            with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-                text_widget.insert(tk.END, content)
+    def refresh_log_file(self, log_file, text_widget, tail_bytes=LOG_TAIL_BYTES, reload=None):
+        """刷新日志文件内容
 
-            # 滚动到底部
-            text_widget.see(tk.END)
+        文件未变化时直接返回；文件只在末尾追加时只插入新增部分；
+        其他情况（轮转、截断、切换文件）重新加载。
 
+        Args:
+            log_file: 日志文件名或路径
+            text_widget: 显示日志的文本框
+            tail_bytes: 只加载文件末尾的字节数，None表示加载完整文件
+            reload: 文件轮转或截断后重新加载的函数，默认重新加载到同一文本框
+        """
+        if not log_file:
+            messagebox.showinfo("提示", "请选择要查看的日志文件")
+            return
+
+        opened = self._open_log_file(log_file)
+        if opened is None:
+            return
+
+        log_path, f = opened
+        key = str(text_widget)
+        prev = self._log_state.get(key)
+        if prev is None or key in self._log_loads or prev[:2] != (log_path, tail_bytes):
+            self._load_log_async(log_path, f, text_widget, tail_bytes)
+            return
+
+        needs_reload = False
+        try:
+            with f:
+                st = os.fstat(f.fileno())
+                _, _, prev_mtime, prev_size = prev
+                if (st.st_mtime_ns, st.st_size) == (prev_mtime, prev_size):
+                    return
+
+                if st.st_size <= prev_size or st.st_mtime_ns < prev_mtime:
+                    # 轮转或截断，重新加载
+                    needs_reload = True
+                else:
+                    self._append_log_tail(f, text_widget, key, prev_size, st)
         except Exception as e:
-            logger.error(f"加载日志文件时发生错误: {e}")
-            messagebox.showerror("错误", f"加载日志文件失败: {str(e)}")
+            logger.error("刷新日志文件时发生错误: %s", e)
+            messagebox.showerror("错误", f"刷新日志文件失败: {str(e)}")
+            return
 
-    def refresh_log_file(self, log_file, text_widget):
-        """刷新日志文件内容"""
-        self.load_log_file(log_file, text_widget)
+        if needs_reload:
+            if reload is not None:
+                reload()
+            else:
+                self.load_log_file(log_file, text_widget, tail_bytes)
+
+    def _append_log_tail(self, f, text_widget, key, prev_size, st):
+        """把日志文件新增的完整行追加到文本框
+
+        Args:
+            f: 已打开的日志文件对象
+            text_widget: 显示日志的文本框
+            key: 文本框路径，用于更新已加载状态
+            prev_size: 上次已加载的字节数
+            st: 文件当前的stat结果
+        """
+        log_path, tail_bytes, _, _ = self._log_state[key]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 只取到最后一个完整行，未写完的行留到下次刷新，避免截断多字节字符
+            end = mm.rfind(b'\n', prev_size, st.st_size) + 1
+            if end <= 0:
+                return
+
+            # 新增部分同样按块解码插入，不整体生成一个字符串
+            autoseparators = text_widget.cget('autoseparators')
+            text_widget.configure(state='normal', autoseparators=False)
+            try:
+                for chunk in _iter_log_chunks(mm, prev_size, end=end):
+                    text_widget.insert(tk.END, chunk)
+                text_widget.see(tk.END)
+            finally:
+                text_widget.configure(state='disabled', autoseparators=autoseparators)
+
+        self._log_state[key] = (log_path, tail_bytes, st.st_mtime_ns, end)
+
+    def on_close(self):
+        """窗口关闭处理，刷新缓冲中的日志"""
+        logger.info("调试启动器已关闭")
+        if _log_file_handler is not None:
+            _log_file_handler.flush()
+        self.root.destroy()
 
     def run(self):
         """运行调试启动器"""
         self.root.mainloop()
 
 
+def main():
+    """启动调试系统"""
+    _configure_logging()
 
-
-if __name__ == "__main__":
     try:
         debug_launcher = DebugLauncher()
         debug_launcher.run()
     except Exception as e:
-        logger.critical(f"启动调试系统时发生错误: {e}", exc_info=True)
+        logger.critical("启动调试系统时发生错误: %s", e, exc_info=True)
         print(f"启动调试系统时发生错误: {e}")
 
         # 如果GUI启动失败，尝试输出更多诊断信息
@@ -973,3 +1636,6 @@ if __name__ == "__main__":
         else:
             print(f"device_controller.py 文件不存在")
 
+
+if __name__ == "__main__":
+    main()
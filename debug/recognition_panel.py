@@ -5,14 +5,85 @@
 import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from PIL import Image, ImageTk
+from PIL import Image, ImageTk, ImageDraw
 import json
+import contextlib
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 import cv2
+import numpy as np
 import time
 
 
 from .utils import pil_to_tk, draw_match_result, generate_timestamp_filename
 
+# 设置环境变量PRELOAD_OCR=1时，打开面板即在后台预加载OCR模型；
+# 预加载会导入torch并可能下载模型，默认在首次识别时才加载
+PRELOAD_OCR = bool(os.environ.get("PRELOAD_OCR"))
+
+
+# EasyOCR读取器缓存 {(语言, 是否GPU): 读取器}，所有面板共用
+_READER_CACHE = {}
+_READER_LOCK = threading.Lock()
+
+
+def _get_reader(langs):
+    """获取EasyOCR读取器，同一语言组合只加载一次模型
+
+    首次创建后用小图预热一次，之后的识别不再承担初始化开销。
+
+    Args:
+        langs: 语言列表
+
+    Returns:
+        easyocr.Reader: 读取器实例
+    """
+    import torch
+
+    gpu = torch.cuda.is_available()
+    key = (tuple(sorted(langs)), gpu)
+    # 后台预加载和主线程可能同时请求，加锁保证只加载一次
+    with _READER_LOCK:
+        reader = _READER_CACHE.get(key)
+        if reader is None:
+            # easyocr很重，只在首次创建读取器时导入
+            import easyocr
+            reader = easyocr.Reader(list(key[0]), gpu=gpu, cudnn_benchmark=True)
+            with torch.inference_mode():
+                reader.readtext(np.zeros((32, 32, 3), dtype=np.uint8))
+            _READER_CACHE[key] = reader
+    return reader
+
+
+def _load_preview(path, max_width, max_height):
+    """读取图像并缩小到预览尺寸，可在后台线程调用
+
+    Args:
+        path: 图像路径
+        max_width: 最大宽度
+        max_height: 最大高度
+
+    Returns:
+        PIL.Image: 预览图像，文件不存在时返回None
+    """
+    if not os.path.exists(path):
+        return None
+
+    image = Image.open(path)
+
+    # 计算缩放比例
+    scale_ratio = min(max_width / image.width, max_height / image.height)
+    if scale_ratio < 1:
+        # 预览图使用双线性插值，比LANCZOS快得多
+        new_width = int(image.width * scale_ratio)
+        new_height = int(image.height * scale_ratio)
+        image = image.resize((new_width, new_height), Image.Resampling.BILINEAR)
+    else:
+        image.load()
+    return image
+
+
 class RecognitionPanel(ttk.Frame):
     """识别功能测试面板"""
     
@@ -31,9 +102,45 @@ class RecognitionPanel(ttk.Frame):
         
         self.test_image = None  # 测试用图像
         self.result_image = None  # 结果图像
+        self._batch_queue = []  # 等待批量识别的截图
+        self._batch_warmed = False  # 批量识别是否已预热
+        self._ocr_pool = ThreadPoolExecutor(max_workers=1)  # 后台OCR线程
+        self._canvas_wh = (400, 300)  # 结果画布尺寸，画布大小变化时更新
         
+        self._preload_future = None  # 后台预加载OCR模型的任务
+        self._visual_path = None  # 本次识别保存的结果图像路径
+        self._preview_cache = {}  # 调试预览图缓存 {(路径, 修改时间, 宽, 高): PhotoImage}
+
         self._setup_ui()
 
+        # 按需在后台预加载OCR模型，首次识别时无需等待模型加载
+        if PRELOAD_OCR:
+            self._preload_future = self._ocr_pool.submit(_get_reader, ('ch_sim', 'en'))
+            self.after(200, self._check_preload)
+
+    def _check_preload(self):
+        """轮询OCR模型预加载任务，失败时显示错误"""
+        future = self._preload_future
+        if not future.done():
+            self.after(200, self._check_preload)
+            return
+
+        error = future.exception()
+        if error is not None:
+            print(f"OCR模型预加载失败: {error}")
+            self.show_info(f"OCR模型预加载失败: {error}")
+
+    def _ocr_preloading(self):
+        """OCR模型仍在后台预加载时提示稍后再试，避免在主线程等待加载
+
+        Returns:
+            bool: 是否仍在预加载
+        """
+        if self._preload_future is None or self._preload_future.done():
+            return False
+        messagebox.showinfo("提示", "OCR模型正在后台加载，请稍后再试")
+        return True
+
     def _setup_ui(self):
         """设置UI组件"""
         # 主分区
@@ -125,6 +232,23 @@ class RecognitionPanel(ttk.Frame):
 
         self.text_threshold_var.trace_add("write", update_text_threshold_label)
 
+        # 截图有效期内查找文本直接使用当前截图，不重新截图
+        ttk.Label(text_recognition_frame, text="截图有效期(秒):").pack(anchor=tk.W, padx=5, pady=2)
+
+        self.refresh_ttl_var = tk.DoubleVar(value=2.0)
+        ttk.Spinbox(text_recognition_frame, from_=0, to=60, increment=0.5,
+                    textvariable=self.refresh_ttl_var).pack(fill=tk.X, padx=5, pady=2)
+
+        # 找到第一个匹配后不再处理其余文本区域
+        self.first_match_only_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(text_recognition_frame, text="首个匹配即返回",
+                        variable=self.first_match_only_var).pack(anchor=tk.W, padx=5, pady=2)
+
+        # 调试图像默认不保存，避免每次识别都编码写入PNG
+        self.debug_save_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(text_recognition_frame, text="保存调试图像",
+                        variable=self.debug_save_var).pack(anchor=tk.W, padx=5, pady=2)
+
         # 文本识别按钮
         ttk.Button(text_recognition_frame, text="查找文本",
                    command=self.run_text_recognition).pack(fill=tk.X, padx=5, pady=5)
@@ -132,10 +256,23 @@ class RecognitionPanel(ttk.Frame):
         ttk.Button(text_recognition_frame, text="获取全部文本",
                    command=self.get_all_text).pack(fill=tk.X, padx=5, pady=5)
 
+        # 批量识别：先逐张加入队列，再一次性识别
+        batch_frame = ttk.Frame(text_recognition_frame)
+        batch_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        ttk.Button(batch_frame, text="加入批量",
+                   command=self.add_to_batch).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Button(batch_frame, text="批量识别",
+                   command=self.run_batch_recognition).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+
         # 添加直接EasyOCR调试按钮
         ttk.Button(text_recognition_frame, text="直接EasyOCR调试",
                    command=self.debug_text_recognition).pack(fill=tk.X, padx=5, pady=5)
 
+        # 查看识别器保存的预处理调试图像
+        ttk.Button(text_recognition_frame, text="查看调试图像",
+                   command=self.show_debug_images).pack(fill=tk.X, padx=5, pady=5)
+
         ttk.Separator(control_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, padx=5, pady=10)
 
         # 结果保存
@@ -158,6 +295,7 @@ class RecognitionPanel(ttk.Frame):
 
         self.result_canvas = tk.Canvas(image_frame, bg="black")
         self.result_canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.result_canvas.bind('<Configure>', lambda e: setattr(self, '_canvas_wh', (e.width, e.height)))
 
         # 下方文本结果
         text_result_frame = ttk.LabelFrame(result_frame, text="文本结果")
@@ -191,8 +329,8 @@ class RecognitionPanel(ttk.Frame):
         # 清除画布
         self.result_canvas.delete("all")
         self.result_canvas.create_text(
-            self.result_canvas.winfo_width() // 2 or 200,
-            self.result_canvas.winfo_height() // 2 or 150,
+            self._canvas_wh[0] // 2,
+            self._canvas_wh[1] // 2,
             text=message,
             fill="white",
             font=("Arial", 12)
@@ -201,6 +339,29 @@ class RecognitionPanel(ttk.Frame):
         # 清除文本
         self.result_text.delete(1.0, tk.END)
 
+    def _readtext(self, reader, image, batched=False, **kwargs):
+        """执行EasyOCR识别，GPU上使用FP16自动混合精度
+
+        Args:
+            reader: EasyOCR读取器
+            image: 待识别图像，批量识别时为图像列表或4维数组
+            batched: 是否使用readtext_batched批量识别
+            **kwargs: 传给readtext的其他参数
+
+        Returns:
+            list: [(边界框, 文本, 置信度), ...]，批量识别时每张图像一个列表
+        """
+        import torch
+
+        read = reader.readtext_batched if batched else reader.readtext
+
+        if reader.device == 'cuda':
+            autocast = torch.autocast(device_type='cuda', dtype=torch.float16)
+        else:
+            autocast = contextlib.nullcontext()
+        with torch.inference_mode(), autocast:
+            return read(image, **kwargs)
+
     def run_text_recognition(self):
         """执行文本识别"""
         try:
@@ -211,8 +372,9 @@ class RecognitionPanel(ttk.Frame):
             self.show_info("正在获取最新截图...")
             self.update()  # 强制更新UI
 
-            # 直接从设备获取新鲜截图
-            if hasattr(self.screen_panel, 'device_controller'):
+            # 当前截图已过期时才从设备获取新鲜截图
+            capture_age = time.time() - getattr(self.screen_panel, 'last_capture_time', 0)
+            if capture_age > self.refresh_ttl_var.get() and hasattr(self.screen_panel, 'device_controller'):
                 print("使用设备控制器获取截图")
                 screenshot = self.screen_panel.device_controller.take_screenshot()
                 if screenshot:
@@ -259,366 +421,341 @@ class RecognitionPanel(ttk.Frame):
             os.makedirs(debug_dir, exist_ok=True)
 
             # 保存当前图像用于调试
-            image_path = os.path.join(debug_dir, 'panel_image.png')
-            image.save(image_path)
+            if self.debug_save_var.get():
+                image_path = os.path.join(debug_dir, 'panel_image.png')
+                image.save(image_path, compress_level=1)
 
             # 执行识别
             lang = self.lang_var.get()
             threshold = self.text_threshold_var.get()
 
             # 添加直接调用EasyOCR的代码
+            context = {
+                'image': image,
+                'target_text': target_text,
+                'roi': roi,
+                'lang': lang,
+                'threshold': threshold,
+                'debug_dir': debug_dir,
+            }
             try:
-                import easyocr
-                import numpy as np
-                import cv2
-
-                # 初始化EasyOCR
-                reader = easyocr.Reader(['ch_sim', 'en'])
-
-                # 转换图像
-                image_np = np.array(image)
+                # 转换图像（只读视图，不复制像素；之后只读取或切片）
+                image_np = np.asarray(image)
                 if roi:
                     x1, y1, x2, y2 = roi
                     image_np = image_np[y1:y2, x1:x2]
 
-                # BGR转换
-                if len(image_np.shape) == 3 and image_np.shape[2] == 3:
-                    image_bgr = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
-                else:
-                    image_bgr = image_np
-
-                # 执行识别
+                # 执行识别（EasyOCR直接接受RGB数组，不再转换为BGR）
                 self.result_text.delete(1.0, tk.END)
                 self.result_text.insert(tk.END, "使用EasyOCR直接识别中...\n\n")
-                self.update()
 
-                results = reader.readtext(image_bgr)
-
-                # 显示结果
-                self.result_text.insert(tk.END, f"识别到 {len(results)} 个文本区域:\n\n")
-
-                # 创建可视化图像
-                visual_img = image_bgr.copy()
-                found = False
-                result = None
+                # 只识别选定区域时按裁剪后的原始分辨率检测，不放大；
+                # 识别阶段每次前向传播处理更多文本框
+                ocr_kwargs = {}
+                if roi:
+                    ocr_kwargs = {'canvas_size': max(image_np.shape[:2]), 'mag_ratio': 1.0, 'batch_size': 8}
 
-                for i, (bbox, detected_text, confidence) in enumerate(results):
-                    self.result_text.insert(tk.END, f"{i + 1}. '{detected_text}' (置信度: {confidence:.2f})\n")
-
-                    # 绘制边界框
-                    pts = np.array(bbox, np.int32).reshape((-1, 1, 2))
-                    color = (0, 255, 0)  # 默认绿色
-
-                    # 检查是否匹配目标文本
-                    if target_text.lower() in detected_text.lower():
-                        self.result_text.insert(tk.END, f"  ✓ 包含目标文本 '{target_text}'\n")
-                        color = (0, 0, 255)  # 红色表示匹配
-                        found = True
-
-                        # 找到匹配结果
-                        x_min = min(point[0] for point in bbox)
-                        y_min = min(point[1] for point in bbox)
-                        x_max = max(point[0] for point in bbox)
-                        y_max = max(point[1] for point in bbox)
-
-                        width = x_max - x_min
-                        height = y_max - y_min
-
-                        # 调整坐标
-                        if roi:
-                            x_min += roi[0]
-                            y_min += roi[1]
-
-                        result = (int(x_min), int(y_min), int(width), int(height))
-
-                    cv2.polylines(visual_img, [pts], True, color, 2)
-
-                    # 添加文本
-                    x_min = min(point[0] for point in bbox)
-                    y_min = min(point[1] for point in bbox)
-                    cv2.putText(
-                        visual_img,
-                        f"{detected_text[:10]}.. ({confidence:.2f})",
-                        (int(x_min), int(y_min) - 10),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.5,
-                        color,
-                        2
-                    )
-
-                # 保存可视化结果
-                visual_path = os.path.join(debug_dir, 'panel_ocr_results.png')
-                cv2.imwrite(visual_path, visual_img)
-
-                if found:
-                    self.result_text.insert(tk.END, f"\n找到目标文本: '{target_text}'\n")
-                    self.result_text.insert(tk.END, f"结果坐标: {result}\n")
-
-                    # 在图像上标记结果
-                    from PIL import ImageDraw
-                    result_image = image.copy()
-                    if result:
-                        x, y, w, h = result
-                        draw = ImageDraw.Draw(result_image)
-                        draw.rectangle([(x, y), (x + w, y + h)], outline="blue", width=2)
-                        draw.text((x, y - 20), target_text, fill="blue")
-
-                    # 显示结果图像
-                    self.display_result(result_image,
-                                        f"找到文本: '{target_text}'\n位置=({result[0]}, {result[1]}), 尺寸={result[2]}x{result[3]}")
-
-                    # 保存结果图像
-                    self.result_image = result_image
-                else:
-                    self.result_text.insert(tk.END, f"\n未找到目标文本: '{target_text}'\n")
-                    self.result_text.insert(tk.END, f"识别结果图像已保存到: {visual_path}")
-
-                    # 显示原始图像
-                    self.display_result(image, f"未找到文本: '{target_text}' (阈值={threshold:.2f})")
-                    self.result_image = image
-
-                # 添加查看按钮
-                if not hasattr(self, 'view_btn'):
-                    self.view_btn = ttk.Button(
-                        self.result_text.master,
-                        text="查看识别结果图像",
-                        command=lambda: os.startfile(visual_path) if os.path.exists(visual_path) else None
-                    )
-                    self.view_btn.pack(after=self.result_text, pady=5)
+                # 在后台线程加载模型并识别，界面保持响应
+                future = self._ocr_pool.submit(
+                    lambda: self._readtext(_get_reader(('ch_sim', 'en')), image_np, **ocr_kwargs))
 
             except Exception as e:
                 self.result_text.insert(tk.END, f"直接识别失败: {str(e)}")
-                import traceback
                 self.result_text.insert(tk.END, f"\n\n{traceback.format_exc()}")
 
-            # 正常的识别流程继续
-            self.result_text.insert(tk.END, "\n\n通过ScreenRecognizer识别:\n")
-
-            result = self.recognizer.find_text(target_text, lang, None, roi, threshold)
+                self._find_text_with_recognizer(context)
+                return
 
-            if result:
-                x, y, w, h = result
-                self.result_text.insert(tk.END, f"找到匹配: ({x}, {y}, {w}, {h})")
-            else:
-                self.result_text.insert(tk.END, "未找到匹配")
+            self.after(50, self._check_ocr, future, image_np, context)
 
         except Exception as e:
             messagebox.showerror("错误", f"文本识别过程出错: {str(e)}")
-            import traceback
             self.result_text.delete(1.0, tk.END)
             self.result_text.insert(tk.END, traceback.format_exc())
 
-    def run_text_recognition(self):
-        """执行文本识别"""
+    def _check_ocr(self, future, image_np, context):
+        """轮询后台识别任务，完成后在主线程显示结果
+
+        Args:
+            future: 后台识别任务
+            image_np: 识别用的RGB图像数组
+            context: 识别参数（原图、目标文本、ROI、语言、阈值、调试目录）
+        """
+        if not future.done():
+            self.after(50, self._check_ocr, future, image_np, context)
+            return
+
         try:
-            # 添加详细日志
-            print("=== 开始文本识别 ===")
+            self._render_ocr_results(future.result(), image_np, context)
+        except Exception as e:
+            self.result_text.insert(tk.END, f"直接识别失败: {str(e)}")
+            self.result_text.insert(tk.END, f"\n\n{traceback.format_exc()}")
 
-            # 显示加载消息
-            self.show_info("正在获取最新截图...")
-            self.update()  # 强制更新UI
+        try:
+            self._find_text_with_recognizer(context)
+        except Exception as e:
+            messagebox.showerror("错误", f"文本识别过程出错: {str(e)}")
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, traceback.format_exc())
 
-            # 直接从设备获取新鲜截图
-            if hasattr(self.screen_panel, 'device_controller'):
-                print("使用设备控制器获取截图")
-                screenshot = self.screen_panel.device_controller.take_screenshot()
-                if screenshot:
-                    print(f"获取到截图，尺寸：{screenshot.size}")
-                    self.screen_panel._display_image(screenshot)
-                    self.update()
-                else:
-                    print("设备控制器未返回截图")
+    def _render_ocr_results(self, results, image_np, context):
+        """显示EasyOCR识别结果并标记目标文本
 
-            # 获取当前图像
-            image = self.screen_panel.get_current_image()
-            if image is None:
-                print("当前图像为空")
-                messagebox.showinfo("提示", "请先在屏幕面板获取截图")
-                return
+        Args:
+            results: readtext返回的识别结果
+            image_np: 识别用的RGB图像数组
+            context: 识别参数（原图、目标文本、ROI、语言、阈值、调试目录）
+        """
+        image = context['image']
+        target_text = context['target_text']
+        roi = context['roi']
+        threshold = context['threshold']
+        debug_dir = context['debug_dir']
+
+        # 结果文本先收集，最后一次性插入
+        lines = [f"识别到 {len(results)} 个文本区域:\n\n"]
+
+        # 只有保存调试图像时才创建并绘制可视化图像（RGB）
+        debug_save = self.debug_save_var.get()
+        visual_img = image_np.copy() if debug_save else None
+        found = False
+        result = None
+        # 边界框按颜色分组，循环结束后每种颜色只调用一次polylines
+        normal_polys = []
+        match_polys = []
+        first_match_only = self.first_match_only_var.get()
+
+        # 所有边界框一次性转为数组，批量求出各框的范围和绘制用的整数顶点
+        boxes = np.asarray([bbox for bbox, _, _ in results], dtype=np.float32).reshape(-1, 4, 2)
+        box_mins = boxes.min(1)
+        box_maxs = boxes.max(1)
+        if debug_save:
+            all_pts = boxes.astype(np.int32).reshape(-1, 4, 1, 2)
+
+        for i, (bbox, detected_text, confidence) in enumerate(results):
+            lines.append(f"{i + 1}. '{detected_text}' (置信度: {confidence:.2f})\n")
+
+            x_min, y_min = box_mins[i]
+            x_max, y_max = box_maxs[i]
+            color = (0, 255, 0)  # 默认绿色
+            polys = normal_polys
+
+            # 检查是否匹配目标文本
+            if target_text.lower() in detected_text.lower():
+                lines.append(f"  ✓ 包含目标文本 '{target_text}'\n")
+                color = (255, 0, 0)  # 红色表示匹配
+                polys = match_polys
+                found = True
+
+                # 找到匹配结果
+                width = x_max - x_min
+                height = y_max - y_min
+
+                # 调整坐标
+                match_x, match_y = x_min, y_min
+                if roi:
+                    match_x += roi[0]
+                    match_y += roi[1]
+
+                result = (int(match_x), int(match_y), int(width), int(height))
+
+            if debug_save:
+                polys.append(all_pts[i])
+
+                # 添加文本
+                cv2.putText(
+                    visual_img,
+                    f"{detected_text[:10]}.. ({confidence:.2f})",
+                    (int(x_min), int(y_min) - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.5,
+                    color,
+                    2
+                )
+
+            if found and first_match_only:
+                break
+
+        if normal_polys:
+            cv2.polylines(visual_img, normal_polys, True, (0, 255, 0), 2)
+        if match_polys:
+            cv2.polylines(visual_img, match_polys, True, (255, 0, 0), 2)
+
+        self.result_text.insert(tk.END, "".join(lines))
+
+        # 保存可视化结果
+        visual_path = os.path.join(debug_dir, 'panel_ocr_results.png')
+        if debug_save:
+            # 只有保存时才转换为OpenCV使用的BGR顺序
+            if visual_img.ndim == 3:
+                code = cv2.COLOR_RGBA2BGRA if visual_img.shape[2] == 4 else cv2.COLOR_RGB2BGR
+                visual_img = cv2.cvtColor(visual_img, code)
+            debug_save = cv2.imwrite(visual_path, visual_img, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+
+        if found:
+            self.result_text.insert(tk.END, f"\n找到目标文本: '{target_text}'\n")
+            self.result_text.insert(tk.END, f"结果坐标: {result}\n")
+
+            # 在图像上标记结果
+            result_image = image.copy()
+            if result:
+                x, y, w, h = result
+                draw = ImageDraw.Draw(result_image)
+                draw.rectangle([(x, y), (x + w, y + h)], outline="blue", width=2)
+                draw.text((x, y - 20), target_text, fill="blue")
 
-            print(f"当前图像尺寸：{image.size}")
+            # 显示结果图像
+            self.display_result(result_image,
+                                f"找到文本: '{target_text}'\n位置=({result[0]}, {result[1]}), 尺寸={result[2]}x{result[3]}")
 
-            # 获取查找文本和参数
-            target_text = self.target_text_var.get()
-            if not target_text:
-                messagebox.showinfo("提示", "请输入要查找的文本")
-                return
-            print(f"目标文本：'{target_text}'")
+            # 保存结果图像
+            self.result_image = result_image
+        else:
+            self.result_text.insert(tk.END, f"\n未找到目标文本: '{target_text}'\n")
+            if debug_save:
+                self.result_text.insert(tk.END, f"识别结果图像已保存到: {visual_path}")
+
+            # 显示原始图像
+            self.display_result(image, f"未找到文本: '{target_text}' (阈值={threshold:.2f})")
+            self.result_image = image
+
+        # 查看按钮只在本次识别保存了结果图像时可用，不打开之前遗留的旧图像
+        self._visual_path = visual_path if debug_save else None
+        if debug_save and not hasattr(self, 'view_btn'):
+            self.view_btn = ttk.Button(
+                self.result_text.master,
+                text="查看识别结果图像",
+                command=lambda: self._visual_path and os.startfile(self._visual_path)
+            )
+            self.view_btn.pack(after=self.result_text, pady=5)
+        if hasattr(self, 'view_btn'):
+            self.view_btn.config(state=tk.NORMAL if debug_save else tk.DISABLED)
+
+    def _find_text_with_recognizer(self, context):
+        """在后台线程通过ScreenRecognizer查找目标文本，完成后追加结果
 
-            # 获取阈值
-            lang = self.lang_var.get()
-            threshold = self.text_threshold_var.get()
-            print(f"使用阈值：{threshold}")
+        Args:
+            context: 识别参数（原图、目标文本、ROI、语言、阈值、调试目录）
+        """
+        target_text = context['target_text']
+        roi = context['roi']
+        lang = context['lang']
+        threshold = context['threshold']
 
-            # 调用识别器前后记录
-            print("开始调用ScreenRecognizer")
-            result = self.recognizer.find_text(target_text, lang, None, roi, threshold)
-            print(f"ScreenRecognizer返回结果：{result}")
+        # 正常的识别流程继续
+        self.result_text.insert(tk.END, "\n\n通过ScreenRecognizer识别:\n")
 
-            # 获取ROI
-            roi = None
-            if self.use_roi_var.get():
-                roi = self.screen_panel.get_selected_roi()
-                if not roi:
-                    messagebox.showinfo("提示", "请在屏幕面板选择区域")
-                    return
+        # find_text会再做一次完整识别，同样放到后台线程，界面保持响应
+        future = self._ocr_pool.submit(self.recognizer.find_text, target_text, lang, None, roi, threshold)
+        self.after(50, self._check_recognizer, future)
 
-            # 显示加载消息
-            self.show_info("正在识别文本...")
-            self.update()  # 强制更新UI
+    def _check_recognizer(self, future):
+        """轮询ScreenRecognizer查找任务，完成后在主线程显示结果
 
-            # 创建调试目录
-            debug_dir = os.path.join(os.getcwd(), 'debug', 'temp')
-            os.makedirs(debug_dir, exist_ok=True)
+        Args:
+            future: 后台查找任务
+        """
+        if not future.done():
+            self.after(50, self._check_recognizer, future)
+            return
 
-            # 保存当前图像用于调试
-            image_path = os.path.join(debug_dir, 'panel_image.png')
-            image.save(image_path)
+        try:
+            result = future.result()
+        except Exception as e:
+            messagebox.showerror("错误", f"文本识别过程出错: {str(e)}")
+            self.result_text.insert(tk.END, traceback.format_exc())
+            return
 
-            # 执行识别
-            lang = self.lang_var.get()
-            threshold = self.text_threshold_var.get()
+        if result:
+            x, y, w, h = result
+            self.result_text.insert(tk.END, f"找到匹配: ({x}, {y}, {w}, {h})")
+        else:
+            self.result_text.insert(tk.END, "未找到匹配")
 
-            # 添加直接调用EasyOCR的代码
-            try:
-                import easyocr
-                import numpy as np
-                import cv2
+    def add_to_batch(self):
+        """把当前截图加入批量识别队列"""
+        image = self.screen_panel.get_current_image()
+        if image is None:
+            messagebox.showinfo("提示", "请先在屏幕面板获取截图")
+            return
 
-                # 初始化EasyOCR
-                reader = easyocr.Reader(['ch_sim', 'en'])
+        # 保持原始尺寸入队，识别时按尺寸分组，不拉伸横屏截图
+        self._batch_queue.append(np.asarray(image.convert('RGB')))
 
-                # 转换图像
-                image_np = np.array(image)
-                if roi:
-                    x1, y1, x2, y2 = roi
-                    image_np = image_np[y1:y2, x1:x2]
+        self.result_text.insert(tk.END, f"已加入批量队列，当前共 {len(self._batch_queue)} 张\n")
 
-                # BGR转换
-                if len(image_np.shape) == 3 and image_np.shape[2] == 3:
-                    image_bgr = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
-                else:
-                    image_bgr = image_np
+    def run_batch_recognition(self):
+        """批量识别队列中的截图"""
+        if not self._batch_queue:
+            messagebox.showinfo("提示", "批量队列为空，请先加入截图")
+            return
 
-                # 执行识别
-                self.result_text.delete(1.0, tk.END)
-                self.result_text.insert(tk.END, "使用EasyOCR直接识别中...\n\n")
-                self.update()
+        images, self._batch_queue = self._batch_queue, []
 
-                results = reader.readtext(image_bgr)
+        self.show_info(f"正在批量识别 {len(images)} 张截图...")
 
-                # 显示结果
-                self.result_text.insert(tk.END, f"识别到 {len(results)} 个文本区域:\n\n")
+        # 在后台线程加载模型并识别，界面保持响应
+        future = self._ocr_pool.submit(self._batch_readtext, images)
+        self.after(50, self._check_batch, future, len(images), self.target_text_var.get())
 
-                # 创建可视化图像
-                visual_img = image_bgr.copy()
-                found = False
-                result = None
+    def _batch_readtext(self, images):
+        """在后台线程批量识别，首次使用时先用小批量预热一次
 
-                for i, (bbox, detected_text, confidence) in enumerate(results):
-                    self.result_text.insert(tk.END, f"{i + 1}. '{detected_text}' (置信度: {confidence:.2f})\n")
-
-                    # 绘制边界框
-                    pts = np.array(bbox, np.int32).reshape((-1, 1, 2))
-                    color = (0, 255, 0)  # 默认绿色
-
-                    # 检查是否匹配目标文本
-                    if target_text.lower() in detected_text.lower():
-                        self.result_text.insert(tk.END, f"  ✓ 包含目标文本 '{target_text}'\n")
-                        color = (0, 0, 255)  # 红色表示匹配
-                        found = True
-
-                        # 找到匹配结果
-                        x_min = min(point[0] for point in bbox)
-                        y_min = min(point[1] for point in bbox)
-                        x_max = max(point[0] for point in bbox)
-                        y_max = max(point[1] for point in bbox)
-
-                        width = x_max - x_min
-                        height = y_max - y_min
-
-                        # 调整坐标
-                        if roi:
-                            x_min += roi[0]
-                            y_min += roi[1]
-
-                        result = (int(x_min), int(y_min), int(width), int(height))
-
-                    cv2.polylines(visual_img, [pts], True, color, 2)
-
-                    # 添加文本
-                    x_min = min(point[0] for point in bbox)
-                    y_min = min(point[1] for point in bbox)
-                    cv2.putText(
-                        visual_img,
-                        f"{detected_text[:10]}.. ({confidence:.2f})",
-                        (int(x_min), int(y_min) - 10),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.5,
-                        color,
-                        2
-                    )
-
-                # 保存可视化结果
-                visual_path = os.path.join(debug_dir, 'panel_ocr_results.png')
-                cv2.imwrite(visual_path, visual_img)
-
-                if found:
-                    self.result_text.insert(tk.END, f"\n找到目标文本: '{target_text}'\n")
-                    self.result_text.insert(tk.END, f"结果坐标: {result}\n")
-
-                    # 在图像上标记结果
-                    result_image = image.copy()
-                    if result:
-                        x, y, w, h = result
-                        draw = ImageDraw.Draw(result_image)
-                        draw.rectangle([(x, y), (x + w, y + h)], outline="blue", width=2)
-                        draw.text((x, y - 20), target_text, fill="blue")
-
-                    # 显示结果图像
-                    self.display_result(result_image,
-                                        f"找到文本: '{target_text}'\n位置=({result[0]}, {result[1]}), 尺寸={result[2]}x{result[3]}")
-
-                    # 保存结果图像
-                    self.result_image = result_image
-                else:
-                    self.result_text.insert(tk.END, f"\n未找到目标文本: '{target_text}'\n")
-                    self.result_text.insert(tk.END, f"识别结果图像已保存到: {visual_path}")
-
-                    # 显示原始图像
-                    self.display_result(image, f"未找到文本: '{target_text}' (阈值={threshold:.2f})")
-                    self.result_image = image
-
-                # 添加查看按钮
-                if not hasattr(self, 'view_btn'):
-                    self.view_btn = ttk.Button(
-                        self.result_text.master,
-                        text="查看识别结果图像",
-                        command=lambda: os.startfile(visual_path) if os.path.exists(visual_path) else None
-                    )
-                    self.view_btn.pack(after=self.result_text, pady=5)
+        Args:
+            images: RGB图像列表，尺寸可以不同
 
-            except Exception as e:
-                self.result_text.insert(tk.END, f"直接识别失败: {str(e)}")
-                import traceback
-                self.result_text.insert(tk.END, f"\n\n{traceback.format_exc()}")
+        Returns:
+            tuple: (每张图像的识别结果列表（与输入顺序一致）, 识别耗时秒数)
+        """
+        reader = _get_reader(('ch_sim', 'en'))
+
+        if not self._batch_warmed:
+            warmup = np.zeros((1, 64, 64, 3), dtype=np.uint8)
+            self._readtext(reader, warmup, batched=True, n_width=64, n_height=64)
+            self._batch_warmed = True
+
+        # 相同尺寸的截图一批识别，按实际尺寸传给readtext_batched，不做缩放
+        groups = {}
+        for index, image in enumerate(images):
+            groups.setdefault(image.shape[:2], []).append(index)
+
+        start_time = time.time()
+        all_results = [None] * len(images)
+        for (height, width), indexes in groups.items():
+            results = self._readtext(reader, [images[i] for i in indexes], batched=True,
+                                     n_width=width, n_height=height)
+            for i, result in zip(indexes, results):
+                all_results[i] = result
+        return all_results, time.time() - start_time
+
+    def _check_batch(self, future, count, target_text):
+        """轮询后台批量识别任务，完成后在主线程显示结果
+
+        Args:
+            future: 后台批量识别任务
+            count: 截图数量
+            target_text: 目标文本
+        """
+        if not future.done():
+            self.after(50, self._check_batch, future, count, target_text)
+            return
 
-            # 正常的识别流程继续
-            self.result_text.insert(tk.END, "\n\n通过ScreenRecognizer识别:\n")
+        try:
+            all_results, elapsed_time = future.result()
 
-            result = self.recognizer.find_text(target_text, lang, None, roi, threshold)
+            lines = [f"批量识别 {count} 张截图 (耗时: {elapsed_time:.2f}秒)\n"]
+            for n, results in enumerate(all_results):
+                lines.append(f"\n截图 {n + 1}: 识别到 {len(results)} 个文本区域\n")
+                for i, (bbox, detected_text, confidence) in enumerate(results):
+                    lines.append(f"{i + 1}. '{detected_text}' (置信度: {confidence:.2f})\n")
+                    if target_text and target_text.lower() in detected_text.lower():
+                        lines.append(f"  ✓ 包含目标文本 '{target_text}'\n")
 
-            if result:
-                x, y, w, h = result
-                self.result_text.insert(tk.END, f"找到匹配: ({x}, {y}, {w}, {h})")
-            else:
-                self.result_text.insert(tk.END, "未找到匹配")
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, "".join(lines))
 
         except Exception as e:
-            messagebox.showerror("错误", f"文本识别过程出错: {str(e)}")
-            import traceback
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, traceback.format_exc())
+            messagebox.showerror("错误", f"批量识别过程出错: {str(e)}")
 
     def show_debug_images(self):
         """显示调试图像"""
@@ -640,32 +777,37 @@ class RecognitionPanel(ttk.Frame):
             # 查找预处理图像
             preprocess_methods = ["原图", "灰度图", "增强对比度", "自适应二值化"]
 
+            canvas_width = 780
+            canvas_height = 550
+
+            # 预览图按路径、修改时间和尺寸缓存，图像文件未变化时直接复用
+            keys = {}
+            for method in preprocess_methods:
+                path = os.path.join(debug_dir, f"{method}.png")
+                try:
+                    keys[method] = (path, os.stat(path).st_mtime_ns, canvas_width, canvas_height)
+                except OSError:
+                    pass
+            missing = [key for key in keys.values() if key not in self._preview_cache]
+
+            # 并行读取和缩放未缓存的图像，PhotoImage只能在主线程创建
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                images = list(pool.map(lambda key: _load_preview(key[0], canvas_width, canvas_height), missing))
+            for key, image in zip(missing, images):
+                if image is not None:
+                    # 同一路径只保留最新的预览
+                    for old in [k for k in self._preview_cache if k[0] == key[0]]:
+                        del self._preview_cache[old]
+                    self._preview_cache[key] = ImageTk.PhotoImage(image)
+
             for method in preprocess_methods:
-                img_path = os.path.join(debug_dir, f"{method}.png")
-                if os.path.exists(img_path):
+                photo = self._preview_cache.get(keys.get(method))
+                if photo is not None:
                     # 创建标签页
                     tab = ttk.Frame(notebook)
                     notebook.add(tab, text=method)
 
-                    # 加载图像
-                    image = Image.open(img_path)
-
-                    # 调整图像大小
-                    canvas_width = 780
-                    canvas_height = 550
-
-                    # 计算缩放比例
-                    width_ratio = canvas_width / image.width
-                    height_ratio = canvas_height / image.height
-                    scale_ratio = min(width_ratio, height_ratio)
-
-                    if scale_ratio < 1:
-                        new_width = int(image.width * scale_ratio)
-                        new_height = int(image.height * scale_ratio)
-                        image = image.resize((new_width, new_height), Image.LANCZOS)
-
                     # 显示图像
-                    photo = ImageTk.PhotoImage(image)
 
                     canvas = tk.Canvas(tab, width=canvas_width, height=canvas_height)
                     canvas.pack(fill=tk.BOTH, expand=True)
@@ -829,7 +971,6 @@ class RecognitionPanel(ttk.Frame):
         scroll.config(command=data_text.yview)
 
         # 添加原始调试数据的JSON表示
-        import json
         # 过滤掉图像数据以避免显示过大
         filtered_results = {k: v for k, v in debug_results.items() if k not in ['original_image']}
 
@@ -989,6 +1130,9 @@ class RecognitionPanel(ttk.Frame):
 
     def debug_image_recognition(self):
         """调试图像识别问题"""
+        if self._ocr_preloading():
+            return
+
         try:
             # 创建调试目录
             debug_dir = os.path.join(os.getcwd(), 'debug', 'temp')
@@ -1030,8 +1174,8 @@ class RecognitionPanel(ttk.Frame):
                         debug_text.insert(tk.END, f"✓ 已保存新截图到 {new_path}\n")
 
                         # 比较两个图像
-                        current_array = np.array(current_image)
-                        new_array = np.array(new_screenshot)
+                        current_array = np.asarray(current_image)
+                        new_array = np.asarray(new_screenshot)
 
                         if current_array.shape != new_array.shape:
                             debug_text.insert(tk.END, f"⚠️ 图像尺寸不同!\n")
@@ -1060,14 +1204,13 @@ class RecognitionPanel(ttk.Frame):
             debug_text.insert(tk.END, "=== 使用EasyOCR分析图像 ===\n\n")
 
             try:
-                import easyocr
-                reader = easyocr.Reader(['ch_sim', 'en'])
+                reader = _get_reader(('ch_sim', 'en'))
 
                 # 处理当前图像
                 debug_text.insert(tk.END, "分析当前图像...\n")
                 debug_text.update()
 
-                current_results = reader.readtext(np.array(current_image))
+                current_results = reader.readtext(np.asarray(current_image))
                 debug_text.insert(tk.END, f"识别到 {len(current_results)} 个文本区域:\n")
 
                 found_in_current = False
@@ -1087,7 +1230,7 @@ class RecognitionPanel(ttk.Frame):
                     debug_text.insert(tk.END, "分析新截图...\n")
                     debug_text.update()
 
-                    new_results = reader.readtext(np.array(new_screenshot))
+                    new_results = reader.readtext(np.asarray(new_screenshot))
                     debug_text.insert(tk.END, f"识别到 {len(new_results)} 个文本区域:\n")
 
                     found_in_new = False
@@ -1098,7 +1241,7 @@ class RecognitionPanel(ttk.Frame):
                             found_in_new = True
 
                             # 标记结果并保存
-                            marked_img = np.array(new_screenshot).copy()
+                            marked_img = np.asarray(new_screenshot).copy()
                             pts = np.array(bbox, np.int32).reshape((-1, 1, 2))
                             cv2.polylines(marked_img, [pts], True, (0, 0, 255), 2)
 
@@ -1111,7 +1254,6 @@ class RecognitionPanel(ttk.Frame):
 
             except Exception as e:
                 debug_text.insert(tk.END, f"EasyOCR分析失败: {str(e)}\n")
-                import traceback
                 debug_text.insert(tk.END, traceback.format_exc())
 
             # 4. 添加查看按钮
@@ -1148,14 +1290,13 @@ class RecognitionPanel(ttk.Frame):
 
         except Exception as e:
             messagebox.showerror("调试错误", str(e))
-            import traceback
             print(traceback.format_exc())
 
     def debug_text_recognition(self):
-        import numpy as np
-        import cv2
-        import time
         """直接使用EasyOCR进行调试识别"""
+        if self._ocr_preloading():
+            return
+
         try:
             # 创建调试目录
             debug_dir = os.path.join(os.getcwd(), 'debug', 'temp')
@@ -1184,7 +1325,6 @@ class RecognitionPanel(ttk.Frame):
                     debug_text.update()
 
                     # 使用与debug_recognition.py相同的方式
-                    import easyocr
                     target_text = self.target_text_var.get() or "斗地主"
 
                     debug_text.insert(tk.END, f"目标文本: '{target_text}'\n")
@@ -1192,8 +1332,9 @@ class RecognitionPanel(ttk.Frame):
                     debug_text.update()
 
                     # 初始化读取器
-                    reader = easyocr.Reader(['ch_sim', 'en'])
+                    reader = _get_reader(('ch_sim', 'en'))
 
+                    # 先准备三种方法的输入，再一次批量识别
                     # 方法1: 使用OpenCV读取保存的图像（与debug_recognition.py相同）
                     debug_text.insert(tk.END, "方法1: 使用OpenCV读取保存的图像\n")
                     img_for_ocr1 = cv2.imread(screenshot_path)
@@ -1201,30 +1342,14 @@ class RecognitionPanel(ttk.Frame):
                     if img_for_ocr1 is None:
                         debug_text.insert(tk.END, "❌ OpenCV无法读取图像，尝试备选方法\n")
                         # 备选：直接从PIL转换为numpy，然后转BGR
-                        img_np = np.array(screenshot)
+                        img_np = np.asarray(screenshot)
                         img_for_ocr1 = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
 
                     debug_text.insert(tk.END, f"图像形状: {img_for_ocr1.shape}, 类型: {img_for_ocr1.dtype}\n")
 
-                    try:
-                        start_time = time.time()
-                        results1 = reader.readtext(img_for_ocr1)
-                        elapsed_time = time.time() - start_time
-
-                        debug_text.insert(tk.END, f"识别到 {len(results1)} 个文本区域 (耗时: {elapsed_time:.2f}秒):\n")
-
-                        found_target1 = False
-                        for i, (bbox, text, confidence) in enumerate(results1):
-                            debug_text.insert(tk.END, f"{i + 1}. '{text}' (置信度: {confidence:.2f})\n")
-                            if target_text.lower() in text.lower():
-                                debug_text.insert(tk.END, f"  ✓ 包含目标文本 '{target_text}'\n")
-                                found_target1 = True
-                    except Exception as e:
-                        debug_text.insert(tk.END, f"❌ 方法1识别出错: {str(e)}\n")
-
                     # 方法2: 直接使用PIL格式转numpy(与recognition_panel.py类似)
                     debug_text.insert(tk.END, "\n方法2: 直接使用PIL图像转换\n")
-                    img_np = np.array(screenshot)
+                    img_np = np.asarray(screenshot)
                     debug_text.insert(tk.END, f"NumPy数组形状: {img_np.shape}, 类型: {img_np.dtype}\n")
 
                     # 检查通道数和处理RGB/RGBA
@@ -1239,51 +1364,56 @@ class RecognitionPanel(ttk.Frame):
 
                     debug_text.insert(tk.END, f"处理后图像形状: {img_for_ocr2.shape}, 类型: {img_for_ocr2.dtype}\n")
 
-                    try:
-                        start_time = time.time()
-                        results2 = reader.readtext(img_for_ocr2)
-                        elapsed_time = time.time() - start_time
-
-                        debug_text.insert(tk.END, f"识别到 {len(results2)} 个文本区域 (耗时: {elapsed_time:.2f}秒):\n")
-
-                        found_target2 = False
-                        for i, (bbox, text, confidence) in enumerate(results2):
-                            debug_text.insert(tk.END, f"{i + 1}. '{text}' (置信度: {confidence:.2f})\n")
-                            if target_text.lower() in text.lower():
-                                debug_text.insert(tk.END, f"  ✓ 包含目标文本 '{target_text}'\n")
-                                found_target2 = True
-                    except Exception as e:
-                        debug_text.insert(tk.END, f"❌ 方法2识别出错: {str(e)}\n")
-
                     # 方法3: 直接使用保存的图像路径
                     debug_text.insert(tk.END, "\n方法3: 直接使用图像文件路径\n")
-                    try:
-                        start_time = time.time()
-                        results3 = reader.readtext(screenshot_path)
-                        elapsed_time = time.time() - start_time
-
-                        debug_text.insert(tk.END, f"识别到 {len(results3)} 个文本区域 (耗时: {elapsed_time:.2f}秒):\n")
+                    debug_text.update()
 
-                        found_target3 = False
-                        for i, (bbox, text, confidence) in enumerate(results3):
+                    methods = [("方法1", img_for_ocr1), ("方法2", img_for_ocr2), ("方法3", screenshot_path)]
+                    all_results = None
+                    # 三种输入尺寸相同时一次批量识别，不会被缩放到统一尺寸
+                    if img_for_ocr1.shape[:2] == img_for_ocr2.shape[:2]:
+                        try:
+                            start_time = time.time()
+                            height, width = img_for_ocr1.shape[:2]
+                            all_results = reader.readtext_batched([image for _, image in methods],
+                                                                  n_width=width, n_height=height)
+                            elapsed_time = time.time() - start_time
+                            debug_text.insert(tk.END, f"\n三种方法批量识别完成 (耗时: {elapsed_time:.2f}秒)\n")
+                        except Exception as e:
+                            debug_text.insert(tk.END, f"❌ 批量识别出错: {str(e)}，改为逐个识别\n")
+                            all_results = None
+
+                    # 批量识别失败或尺寸不同时逐个识别，每种方法单独报告错误
+                    if all_results is None:
+                        all_results = []
+                        for name, image in methods:
+                            try:
+                                all_results.append(reader.readtext(image))
+                            except Exception as e:
+                                debug_text.insert(tk.END, f"❌ {name}识别出错: {str(e)}\n")
+                                all_results.append(None)
+
+                    found_targets = []
+                    for (name, _), results in zip(methods, all_results):
+                        if results is None:
+                            found_targets.append(None)
+                            continue
+                        debug_text.insert(tk.END, f"\n{name}识别到 {len(results)} 个文本区域:\n")
+
+                        found = False
+                        for i, (bbox, text, confidence) in enumerate(results):
                             debug_text.insert(tk.END, f"{i + 1}. '{text}' (置信度: {confidence:.2f})\n")
                             if target_text.lower() in text.lower():
                                 debug_text.insert(tk.END, f"  ✓ 包含目标文本 '{target_text}'\n")
-                                found_target3 = True
-                    except Exception as e:
-                        debug_text.insert(tk.END, f"❌ 方法3识别出错: {str(e)}\n")
+                                found = True
+                        found_targets.append(found)
 
-                    # 添加对比结论
+                    # 添加对比结论（识别出错的方法不参与对比）
                     debug_text.insert(tk.END, "\n对比结论:\n")
-                    if 'found_target1' in locals():
-                        debug_text.insert(tk.END,
-                                          f"方法1 (OpenCV读取): {'找到' if found_target1 else '未找到'} '{target_text}'\n")
-                    if 'found_target2' in locals():
-                        debug_text.insert(tk.END,
-                                          f"方法2 (PIL转NumPy): {'找到' if found_target2 else '未找到'} '{target_text}'\n")
-                    if 'found_target3' in locals():
-                        debug_text.insert(tk.END,
-                                          f"方法3 (文件路径): {'找到' if found_target3 else '未找到'} '{target_text}'\n")
+                    labels = ["方法1 (OpenCV读取)", "方法2 (PIL转NumPy)", "方法3 (文件路径)"]
+                    for label, found in zip(labels, found_targets):
+                        if found is not None:
+                            debug_text.insert(tk.END, f"{label}: {'找到' if found else '未找到'} '{target_text}'\n")
 
                     # 保存调试日志
                     log_path = os.path.join(debug_dir, 'easyocr_comparison.log')
@@ -1297,7 +1427,6 @@ class RecognitionPanel(ttk.Frame):
                 messagebox.showinfo("提示", "设备控制器不可用")
         except Exception as e:
             messagebox.showerror("调试错误", str(e))
-            import traceback
             print(traceback.format_exc())
 
 
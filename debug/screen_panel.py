@@ -3,6 +3,7 @@
 提供屏幕截取和区域选择功能
 """
 import os
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from PIL import Image, ImageTk
@@ -34,6 +35,7 @@ class ScreenPanel(ttk.Frame):
         self.device_controller = device_controller
         self.current_image = None
         self.current_tk_image = None
+        self.last_capture_time = 0  # 最近一次显示新图像的时间
         self.roi_start = None
         self.roi_end = None
         self.roi_rectangle = None
@@ -218,6 +220,7 @@ class ScreenPanel(ttk.Frame):
         # 转换为Tkinter图像
         self.current_tk_image = ImageTk.PhotoImage(image)
         self.current_image = image
+        self.last_capture_time = time.time()
 
         # 清除画布并显示图像
         self.canvas.delete("all")